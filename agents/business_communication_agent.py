@@ -3,9 +3,43 @@ Business Communication Agent - Generates executive-ready materials
 Translates technical strategy into stakeholder-friendly formats
 """
 
+import functools
+
 import dspy
 
 from signatures.dspy_signatures import BusinessCommunicationGenerator
+from utils.compiled import load_compiled
+from utils.llm_cache import cached_llm
+from utils.logger import setup_logger
+from utils.render import render_risk_matrix, render_timeline
+from utils.retry import llm_retry
+from utils.tokens import truncate_tokens
+
+logger = setup_logger("agentic.business_communication")
+
+_MATERIAL_FIELDS = (
+    "executive_summary",
+    "risk_matrix",
+    "timeline_visual",
+    "budget_justification",
+    "stakeholder_talking_points",
+)
+
+# Built once; error responses copy it instead of re-allocating the strings
+_ERROR_TEMPLATE = {field: "Unable to generate" for field in _MATERIAL_FIELDS}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_generator():
+    """Process-wide generator singleton shared across agent instances"""
+    return load_compiled(
+        dspy.Predict(BusinessCommunicationGenerator), "BusinessCommunicationGenerator"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_generator_async():
+    return dspy.asyncify(_get_generator())
 
 
 class BusinessCommunicationAgent:
@@ -19,7 +53,8 @@ class BusinessCommunicationAgent:
     """
 
     def __init__(self):
-        self.generator = dspy.ChainOfThought(BusinessCommunicationGenerator)
+        self.generator = _get_generator()
+        self.generator_async = _get_generator_async()
 
     def analyze(self, ml_recommendations: dict, deployment_strategy: dict) -> dict:
         """
@@ -32,36 +67,68 @@ class BusinessCommunicationAgent:
         Returns:
             Dict with executive-ready materials
         """
-        # Prepare inputs
-        ml_use_case = self._format_ml_use_case(ml_recommendations)
-        deployment_summary = self._format_deployment_summary(deployment_strategy)
-        technical_risks = deployment_strategy.get(
-            "risk_mitigation", "No risks identified"
-        )
-        success_metrics = deployment_strategy.get(
-            "success_metrics", "No metrics defined"
-        )
+        inputs = self._build_inputs(ml_recommendations, deployment_strategy)
 
         try:
-            communication_materials = self.generator(
-                ml_use_case=ml_use_case,
-                deployment_summary=deployment_summary,
-                technical_risks=technical_risks,
-                success_metrics=success_metrics,
-            )
-
-            return {
-                "executive_summary": communication_materials.executive_summary,
-                "risk_matrix": communication_materials.risk_matrix,
-                "timeline_visual": communication_materials.timeline_visual,
-                "budget_justification": communication_materials.budget_justification,
-                "stakeholder_talking_points": communication_materials.stakeholder_talking_points,
-            }
+            return self._generate(**inputs)
+        except Exception as e:
+            logger.exception("Business communication generation failed")
+            return self._generate_error_response(str(e))
+
+    async def analyze_async(
+        self, ml_recommendations: dict, deployment_strategy: dict
+    ) -> dict:
+        """Async variant of analyze() for concurrent orchestration"""
+        inputs = self._build_inputs(ml_recommendations, deployment_strategy)
 
+        try:
+            return await self._generate_async(**inputs)
         except Exception as e:
-            print(f"❌ Business communication generation failed: {str(e)}")
+            logger.exception("Business communication generation failed")
             return self._generate_error_response(str(e))
 
+    @cached_llm("business_communication")
+    @llm_retry
+    def _generate(self, **inputs) -> dict:
+        """Run the generator; cached on the formatted inputs"""
+        return self._build_response(self.generator(**inputs))
+
+    @cached_llm("business_communication")
+    @llm_retry
+    async def _generate_async(self, **inputs) -> dict:
+        """Async generator call sharing the same cache namespace as _generate"""
+        return self._build_response(await self.generator_async(**inputs))
+
+    def _build_inputs(
+        self, ml_recommendations: dict, deployment_strategy: dict
+    ) -> dict:
+        """Prepare generator inputs from upstream agent outputs"""
+        return {
+            "ml_use_case": self._format_ml_use_case(ml_recommendations),
+            "deployment_summary": self._format_deployment_summary(deployment_strategy),
+            "technical_risks": deployment_strategy.get(
+                "risk_mitigation", "No risks identified"
+            ),
+            "success_metrics": deployment_strategy.get(
+                "success_metrics", "No metrics defined"
+            ),
+        }
+
+    def _build_response(self, communication_materials) -> dict:
+        """Map generator output fields onto the result dict
+
+        The risk matrix and timeline come back as JSON data and are
+        rendered into markdown/Mermaid here, so downstream consumers
+        still see the same risk_matrix/timeline_visual keys
+        """
+        return {
+            "executive_summary": communication_materials.executive_summary,
+            "risk_matrix": render_risk_matrix(communication_materials.risks_json),
+            "timeline_visual": render_timeline(communication_materials.timeline_json),
+            "budget_justification": communication_materials.budget_justification,
+            "stakeholder_talking_points": communication_materials.stakeholder_talking_points,
+        }
+
     def _format_ml_use_case(self, ml_recommendations: dict) -> str:
         """Format ML use case summary"""
         use_case = ml_recommendations["ml_use_case"]
@@ -75,17 +142,10 @@ class BusinessCommunicationAgent:
         )
         costs = deployment_strategy.get("cost_estimation", "Costs not estimated")
 
-        # Extract key numbers if available (simplified)
-        summary = f"Team: {team[:100]}... | Timeline: {timeline[:100]}... | Costs: {costs[:100]}..."
+        # Token-budgeted highlights (simplified)
+        summary = f"Team: {truncate_tokens(team, 25)} | Timeline: {truncate_tokens(timeline, 25)} | Costs: {truncate_tokens(costs, 25)}"
         return summary
 
     def _generate_error_response(self, error: str) -> dict:
-        """Generate error response"""
-        error_msg = f"Error: {error}"
-        return {
-            "executive_summary": error_msg,
-            "risk_matrix": "Unable to generate",
-            "timeline_visual": "Unable to generate",
-            "budget_justification": "Unable to generate",
-            "stakeholder_talking_points": "Unable to generate",
-        }
+        """Generate error response (single copy of the template)"""
+        return {**_ERROR_TEMPLATE, "executive_summary": f"Error: {error}"}
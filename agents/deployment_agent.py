@@ -3,9 +3,42 @@ Deployment Agent - Generates comprehensive MLOps strategy
 Provides team sizing, timelines, costs, governance, and operational plans
 """
 
+import functools
+
 import dspy
 
 from signatures.dspy_signatures import DatabricksDeploymentPlanner
+from utils.compiled import load_compiled
+from utils.llm_cache import cached_llm
+from utils.logger import setup_logger
+from utils.retry import llm_retry
+
+logger = setup_logger("agentic.deployment")
+
+# Output fields in signature order, used to stream results incrementally
+_PLAN_FIELDS = tuple(DatabricksDeploymentPlanner.output_fields)
+
+# Built once; error responses copy it instead of re-allocating 15 strings
+_ERROR_TEMPLATE = {field: "Unable to generate" for field in _PLAN_FIELDS}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_planner():
+    """Process-wide planner singleton shared across agent instances"""
+    return load_compiled(
+        dspy.Predict(DatabricksDeploymentPlanner), "DatabricksDeploymentPlanner"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_planner_async():
+    return dspy.asyncify(_get_planner())
+
+
+@functools.lru_cache(maxsize=32)
+def _data_summary(total_rows: int, total_columns: int, memory_mb: float) -> str:
+    """Memoized data summary string shared across retries and runs"""
+    return f"{total_rows} rows, {total_columns} columns, {memory_mb:.1f}MB"
 
 
 class DeploymentAgent:
@@ -20,7 +53,8 @@ class DeploymentAgent:
     """
 
     def __init__(self):
-        self.planner = dspy.ChainOfThought(DatabricksDeploymentPlanner)
+        self.planner = _get_planner()
+        self.planner_async = _get_planner_async()
 
     def analyze(self, schema_results: dict, ml_recommendations: dict) -> dict:
         """
@@ -33,49 +67,106 @@ class DeploymentAgent:
         Returns:
             Dict with complete deployment strategy
         """
-        # Prepare inputs
-        ml_use_case = self._format_ml_use_case(ml_recommendations)
-        feature_plan = ml_recommendations["feature_engineering"]["feature_plan"]
-        training_plan = ml_recommendations["feature_engineering"][
-            "training_recommendations"
-        ]
-        data_summary = self._format_data_summary(schema_results)
+        inputs = self._build_inputs(schema_results, ml_recommendations)
 
         try:
-            deployment_plan = self.planner(
-                ml_use_case=ml_use_case,
-                feature_plan=feature_plan,
-                training_plan=training_plan,
-                data_summary=data_summary,
-            )
-
-            return {
-                # Technical Infrastructure
-                "databricks_setup": deployment_plan.databricks_setup,
-                "serving_strategy": deployment_plan.serving_strategy,
-                "monitoring_plan": deployment_plan.monitoring_plan,
-                "data_strategy": deployment_plan.data_strategy,
-                # Team & Timeline
-                "team_requirements": deployment_plan.team_requirements,
-                "implementation_roadmap": deployment_plan.implementation_roadmap,
-                "risk_mitigation": deployment_plan.risk_mitigation,
-                # Governance & Business
-                "cost_estimation": deployment_plan.cost_estimation,
-                "governance_framework": deployment_plan.governance_framework,
-                "success_metrics": deployment_plan.success_metrics,
-                "business_impact": deployment_plan.business_impact,
-                # Operations & Quality
-                "testing_framework": deployment_plan.testing_framework,
-                "operational_playbook": deployment_plan.operational_playbook,
-                "enablement_plan": deployment_plan.enablement_plan,
-                # Future Vision
-                "future_enhancements": deployment_plan.future_enhancements,
-            }
+            return self._plan(**inputs)
+        except Exception as e:
+            logger.exception("Deployment planning failed")
+            return self._generate_error_response(str(e))
+
+    async def analyze_async(
+        self, schema_results: dict, ml_recommendations: dict
+    ) -> dict:
+        """Async variant of analyze() for concurrent orchestration"""
+        inputs = self._build_inputs(schema_results, ml_recommendations)
 
+        try:
+            return await self._plan_async(**inputs)
         except Exception as e:
-            print(f"❌ Deployment planning failed: {str(e)}")
+            logger.exception("Deployment planning failed")
             return self._generate_error_response(str(e))
 
+    async def analyze_stream(self, schema_results: dict, ml_recommendations: dict):
+        """
+        Stream the deployment strategy field by field
+
+        Async generator yielding (field_name, value) tuples as each output
+        field finishes decoding, so consumers can start rendering or
+        formatting early fields while the tail is still generating.
+        Latency to the first usable field is a fraction of full-plan
+        latency; analyze() remains the blocking all-at-once path.
+        """
+        inputs = self._build_inputs(schema_results, ml_recommendations)
+        listeners = [
+            dspy.streaming.StreamListener(signature_field_name=field)
+            for field in _PLAN_FIELDS
+        ]
+        stream = dspy.streamify(self.planner, stream_listeners=listeners)
+
+        buffers = {}
+        emitted = set()
+        async for chunk in stream(**inputs):
+            if isinstance(chunk, dspy.streaming.StreamResponse):
+                field = chunk.signature_field_name
+                buffers.setdefault(field, []).append(chunk.chunk)
+                if chunk.is_last_chunk:
+                    emitted.add(field)
+                    yield field, "".join(buffers[field])
+            elif isinstance(chunk, dspy.Prediction):
+                # Flush anything the listeners did not close out
+                for field in _PLAN_FIELDS:
+                    if field not in emitted:
+                        yield field, getattr(chunk, field)
+
+    @cached_llm("deployment")
+    @llm_retry
+    def _plan(self, **inputs) -> dict:
+        """Run the planner; cached on the formatted inputs"""
+        return self._build_response(self.planner(**inputs))
+
+    @cached_llm("deployment")
+    @llm_retry
+    async def _plan_async(self, **inputs) -> dict:
+        """Async planner call sharing the same cache namespace as _plan"""
+        return self._build_response(await self.planner_async(**inputs))
+
+    def _build_inputs(self, schema_results: dict, ml_recommendations: dict) -> dict:
+        """Prepare planner inputs from upstream agent outputs"""
+        return {
+            "ml_use_case": self._format_ml_use_case(ml_recommendations),
+            "feature_plan": ml_recommendations["feature_engineering"]["feature_plan"],
+            "training_plan": ml_recommendations["feature_engineering"][
+                "training_recommendations"
+            ],
+            "data_summary": self._format_data_summary(schema_results),
+        }
+
+    def _build_response(self, deployment_plan) -> dict:
+        """Map planner output fields onto the result dict"""
+        return {
+            # Technical Infrastructure
+            "databricks_setup": deployment_plan.databricks_setup,
+            "serving_strategy": deployment_plan.serving_strategy,
+            "monitoring_plan": deployment_plan.monitoring_plan,
+            "data_strategy": deployment_plan.data_strategy,
+            # Team & Timeline
+            "team_requirements": deployment_plan.team_requirements,
+            "implementation_roadmap": deployment_plan.implementation_roadmap,
+            "risk_mitigation": deployment_plan.risk_mitigation,
+            # Governance & Business
+            "cost_estimation": deployment_plan.cost_estimation,
+            "governance_framework": deployment_plan.governance_framework,
+            "success_metrics": deployment_plan.success_metrics,
+            "business_impact": deployment_plan.business_impact,
+            # Operations & Quality
+            "testing_framework": deployment_plan.testing_framework,
+            "operational_playbook": deployment_plan.operational_playbook,
+            "enablement_plan": deployment_plan.enablement_plan,
+            # Future Vision
+            "future_enhancements": deployment_plan.future_enhancements,
+        }
+
     def _format_ml_use_case(self, ml_recommendations: dict) -> str:
         """Format ML use case for deployment planning"""
         use_case = ml_recommendations["ml_use_case"]
@@ -84,25 +175,12 @@ class DeploymentAgent:
     def _format_data_summary(self, schema_results: dict) -> str:
         """Format data summary with key metrics"""
         summary = schema_results["summary"]
-        return f"{summary['total_rows']} rows, {summary['total_columns']} columns, {summary['memory_usage_mb']:.1f}MB"
+        return _data_summary(
+            summary["total_rows"],
+            summary["total_columns"],
+            float(summary["memory_usage_mb"]),
+        )
 
     def _generate_error_response(self, error: str) -> dict:
-        """Generate structured error response"""
-        error_msg = f"Error: {error}"
-        return {
-            "databricks_setup": error_msg,
-            "serving_strategy": "Unable to generate",
-            "monitoring_plan": "Unable to generate",
-            "data_strategy": "Unable to generate",
-            "team_requirements": "Unable to generate",
-            "implementation_roadmap": "Unable to generate",
-            "risk_mitigation": "Unable to generate",
-            "cost_estimation": "Unable to generate",
-            "governance_framework": "Unable to generate",
-            "success_metrics": "Unable to generate",
-            "business_impact": "Unable to generate",
-            "testing_framework": "Unable to generate",
-            "operational_playbook": "Unable to generate",
-            "enablement_plan": "Unable to generate",
-            "future_enhancements": "Unable to generate",
-        }
+        """Generate structured error response (single copy of the template)"""
+        return {**_ERROR_TEMPLATE, "databricks_setup": f"Error: {error}"}
@@ -3,9 +3,40 @@ Product Owner Agent - Generates Product Requirements Document (PRD)
 Synthesizes all analysis into actionable requirements document
 """
 
+import asyncio
+import functools
+import os
+import re
+
 import dspy
 
-from signatures.dspy_signatures import PRDGenerator
+from signatures.dspy_signatures import (PRD_GUIDANCE, PRD_SECTION_TEMPLATES,
+                                        PRDSectionGenerator)
+from utils.llm_cache import cached_llm
+from utils.logger import setup_logger
+from utils.retry import llm_retry
+from utils.tokens import truncate_tokens
+
+logger = setup_logger("agentic.po")
+
+# Per-section decode budget: a section runs a few hundred tokens, so
+# this caps runaway lists well below the model's default ceiling while
+# leaving headroom for the long tabular sections
+_SECTION_MAX_TOKENS = int(os.getenv("PRD_SECTION_MAX_TOKENS", "1500"))
+
+# Numbered top-level section headings ("## 3. Goals ...")
+_SECTION_HEADING_RE = re.compile(r"\n## (\d+)\.")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_section_generator():
+    """Process-wide section generator singleton shared across agent instances"""
+    return dspy.Predict(PRDSectionGenerator, max_tokens=_SECTION_MAX_TOKENS)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_section_generator_async():
+    return dspy.asyncify(_get_section_generator())
 
 
 class POAgent:
@@ -16,11 +47,15 @@ class POAgent:
     - Business communication (ROI, stakeholders)
     - Quality assessment (risks, data issues)
 
-    Output: Structured PRD ready for stakeholder review
+    Output: Structured PRD ready for stakeholder review. The document
+    generates one section per concurrent LLM call — decode time
+    dominates a 17-section document, so parallel section decoding cuts
+    wall time to roughly the slowest section instead of their sum.
     """
 
     def __init__(self):
-        self.generator = dspy.ChainOfThought(PRDGenerator)
+        self.section_generator = _get_section_generator()
+        self.section_generator_async = _get_section_generator_async()
 
     def generate_prd(
         self,
@@ -33,6 +68,8 @@ class POAgent:
         """
         Generate PRD from all agent outputs
 
+        Thin sync wrapper around generate_prd_async()
+
         Args:
             schema_results: Output from SchemaAgent
             quality_results: Output from QualityAgent
@@ -43,30 +80,139 @@ class POAgent:
         Returns:
             Dict with PRD document
         """
-        # Prepare synthesized inputs
-        ml_use_case = self._format_ml_use_case(ml_recommendations)
-        feature_engineering = self._format_feature_engineering(ml_recommendations)
-        deployment_summary = self._format_deployment_summary(deployment_strategy)
-        business_summary = self._format_business_summary(business_communication)
-        quality_issues = self._format_quality_issues(quality_results)
+        return asyncio.run(
+            self.generate_prd_async(
+                schema_results,
+                quality_results,
+                ml_recommendations,
+                deployment_strategy,
+                business_communication,
+            )
+        )
+
+    async def generate_prd_async(
+        self,
+        schema_results: dict,
+        quality_results: dict,
+        ml_recommendations: dict,
+        deployment_strategy: dict,
+        business_communication: dict,
+    ) -> dict:
+        """
+        Generate all PRD sections concurrently and stitch them in
+        document order; a failed section degrades to a placeholder
+        instead of losing the whole document
+        """
+        inputs = self._build_inputs(
+            schema_results,
+            quality_results,
+            ml_recommendations,
+            deployment_strategy,
+            business_communication,
+        )
+
+        outcomes = await asyncio.gather(
+            *[self._section(template, inputs) for template in PRD_SECTION_TEMPLATES]
+        )
+        document = "\n\n".join(text for text, _ in outcomes)
+        succeeded = any(ok for _, ok in outcomes)
+        return {
+            "prd_document": document,
+            "status": "success" if succeeded else "error",
+        }
+
+    async def generate_prd_stream(
+        self,
+        schema_results: dict,
+        quality_results: dict,
+        ml_recommendations: dict,
+        deployment_strategy: dict,
+        business_communication: dict,
+    ):
+        """
+        Stream the PRD section by section
 
+        Every section starts decoding immediately; each is yielded in
+        document order as soon as it finishes, so the UI fills in while
+        later sections are still generating.
+        """
+        inputs = self._build_inputs(
+            schema_results,
+            quality_results,
+            ml_recommendations,
+            deployment_strategy,
+            business_communication,
+        )
+
+        tasks = [
+            asyncio.ensure_future(self._section(template, inputs))
+            for template in PRD_SECTION_TEMPLATES
+        ]
+        for index, task in enumerate(tasks):
+            text, _ = await task
+            yield text if index == 0 else "\n\n" + text
+
+    async def _section(self, section_template: str, inputs: dict) -> tuple:
+        """
+        Generate one section; returns (markdown, succeeded) and degrades
+        to a titled placeholder on failure
+        """
         try:
-            prd_output = self.generator(
-                ml_use_case=ml_use_case,
-                feature_engineering=feature_engineering,
-                deployment_strategy=deployment_summary,
-                business_summary=business_summary,
-                quality_issues=quality_issues,
+            text = await self._generate_section(
+                section_template=section_template, **inputs
             )
+            return self._clip_overrun(text, section_template), True
+        except Exception as e:
+            logger.exception("PRD section generation failed")
+            title = section_template.splitlines()[0]
+            return f"{title}\n\n_Section generation failed: {str(e)}_", False
 
-            return {"prd_document": prd_output.prd_document, "status": "success"}
+    @staticmethod
+    def _clip_overrun(text: str, section_template: str) -> str:
+        """
+        Drop anything decoded past this section's boundary. A numbered
+        heading that belongs to a different section means the model ran
+        on into its neighbours; clipping client-side keeps the stitched
+        document free of duplicates. (A server-side stop sequence on
+        "\\n## " would also truncate legitimate intra-section headings
+        and the adapter's end-of-field marker, so the cut happens here.)
+        """
+        own = _SECTION_HEADING_RE.search("\n" + section_template)
+        own_number = own.group(1) if own else None
+        for match in _SECTION_HEADING_RE.finditer(text):
+            if match.group(1) != own_number:
+                return text[: match.start()].rstrip()
+        return text
 
-        except Exception as e:
-            print(f"❌ PRD generation failed: {str(e)}")
-            return {
-                "prd_document": f"# PRD Generation Failed\n\nError: {str(e)}",
-                "status": "error",
-            }
+    @cached_llm("prd_section")
+    @llm_retry
+    async def _generate_section(self, **inputs) -> str:
+        """One section call; cached on the section template and context"""
+        prediction = await self.section_generator_async(
+            prd_guidance=PRD_GUIDANCE, **inputs
+        )
+        return prediction.section_markdown
+
+    def _build_inputs(
+        self,
+        schema_results: dict,
+        quality_results: dict,
+        ml_recommendations: dict,
+        deployment_strategy: dict,
+        business_communication: dict,
+    ) -> dict:
+        """Prepare the shared section-generator context from all agent outputs"""
+        return {
+            "ml_use_case": self._format_ml_use_case(ml_recommendations),
+            "feature_engineering": self._format_feature_engineering(
+                ml_recommendations
+            ),
+            "deployment_strategy": self._format_deployment_summary(
+                deployment_strategy
+            ),
+            "business_summary": self._format_business_summary(business_communication),
+            "quality_issues": self._format_quality_issues(quality_results),
+        }
 
     def _format_ml_use_case(self, ml_recommendations: dict) -> str:
         """Format ML use case summary"""
@@ -84,7 +230,7 @@ class POAgent:
         feature_eng = ml_recommendations["feature_engineering"]
         return f"""
 **Feature Plan**:
-{feature_eng.get('feature_plan', 'N/A')[:500]}...
+{truncate_tokens(feature_eng.get('feature_plan', 'N/A'), 125)}
 
 **Training Strategy**:
 {feature_eng.get('training_recommendations', 'N/A')}
@@ -96,19 +242,19 @@ class POAgent:
     def _format_deployment_summary(self, deployment_strategy: dict) -> str:
         """Format deployment summary"""
         return f"""
-**Team Requirements**: {deployment_strategy.get('team_requirements', 'N/A')[:300]}...
-**Timeline**: {deployment_strategy.get('implementation_roadmap', 'N/A')[:300]}...
-**Costs**: {deployment_strategy.get('cost_estimation', 'N/A')[:300]}...
-**Infrastructure**: {deployment_strategy.get('databricks_setup', 'N/A')[:300]}...
-**Monitoring**: {deployment_strategy.get('monitoring_plan', 'N/A')[:200]}...
+**Team Requirements**: {truncate_tokens(deployment_strategy.get('team_requirements', 'N/A'), 75)}
+**Timeline**: {truncate_tokens(deployment_strategy.get('implementation_roadmap', 'N/A'), 75)}
+**Costs**: {truncate_tokens(deployment_strategy.get('cost_estimation', 'N/A'), 75)}
+**Infrastructure**: {truncate_tokens(deployment_strategy.get('databricks_setup', 'N/A'), 75)}
+**Monitoring**: {truncate_tokens(deployment_strategy.get('monitoring_plan', 'N/A'), 50)}
 """
 
     def _format_business_summary(self, business_communication: dict) -> str:
         """Format business summary"""
         return f"""
-**Executive Summary**: {business_communication.get('executive_summary', 'N/A')[:400]}...
-**ROI Justification**: {business_communication.get('budget_justification', 'N/A')[:300]}...
-**Success Metrics**: {business_communication.get('stakeholder_talking_points', 'N/A')[:200]}...
+**Executive Summary**: {truncate_tokens(business_communication.get('executive_summary', 'N/A'), 100)}
+**ROI Justification**: {truncate_tokens(business_communication.get('budget_justification', 'N/A'), 75)}
+**Success Metrics**: {truncate_tokens(business_communication.get('stakeholder_talking_points', 'N/A'), 50)}
 """
 
     def _format_quality_issues(self, quality_results: dict) -> str:
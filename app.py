@@ -3,6 +3,9 @@ Streamlit App - Phase 1A: Schema Analysis Only
 Single-page interface for uploading CSV and viewing schema analysis
 """
 
+import hashlib
+import io
+import json
 import os
 import sys
 
@@ -11,14 +14,17 @@ import pandas as pd
 import streamlit as st
 
 from agents.supervisor import SupervisorAgent
-from config import OPENAI_API_KEY, OPENAI_MODEL
-
-st.cache_data.clear()
-st.cache_resource.clear()
+from config import MAX_ROWS_FOR_ANALYSIS, OPENAI_API_KEY, OPENAI_MODEL
 
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Dev-only escape hatch: unconditional purges here would defeat every
+# cache on every rerun, so flushing must be opted into explicitly
+if os.getenv("DEV_CLEAR_CACHE"):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
 # if "dspy_initialized" not in st.session_state:
 #     dspy.configure(lm=dspy.LM("openai/gpt-4o", api_key=OPENAI_API_KEY))
 #     st.session_state.dspy_initialized = True
@@ -31,20 +37,134 @@ st.set_page_config(page_title="Agentic Data Analyst", page_icon="🤖", layout="
 # Initialize session state
 if "analysis_results" not in st.session_state:
     st.session_state.analysis_results = None
-if "uploaded_df" not in st.session_state:
-    st.session_state.uploaded_df = None
 if "prd_result" not in st.session_state:
     st.session_state.prd_result = None
 if "last_file" not in st.session_state:
     st.session_state.last_file = None
+if "parquet_bytes" not in st.session_state:
+    st.session_state.parquet_bytes = None
+
+@st.cache_resource(show_spinner=False)
+def get_supervisor() -> SupervisorAgent:
+    """
+    Build the supervisor once per server process.
+
+    Construction configures DSPy and instantiates every agent; at module
+    level that work repeated on each Streamlit rerun
+    """
+    return SupervisorAgent()
+
+
+@st.cache_data(show_spinner=False)
+def _load_csv(file_bytes: bytes) -> pd.DataFrame:
+    """
+    Parse an uploaded CSV once per unique content.
+
+    Streamlit reruns the whole script on every widget interaction;
+    keying on the raw bytes means reruns (and re-uploads of the same
+    file) reuse the parsed DataFrame instead of re-tokenizing the CSV.
+    """
+    try:
+        # Arrow's multi-threaded CSV reader; the result stays a plain
+        # NumPy-backed frame so downstream dtype handling is unchanged
+        df = pd.read_csv(
+            io.BytesIO(file_bytes), encoding="latin-1", engine="pyarrow"
+        )
+    except Exception:
+        # pyarrow rejects some encodings/layouts the C engine accepts
+        df = pd.read_csv(io.BytesIO(file_bytes), encoding="latin-1")
+    return _compact(df)
+
+
+@st.cache_data(show_spinner=False)
+def _summary_df(columns_data_json: str) -> pd.DataFrame:
+    """
+    Build the schema summary table once per distinct analysis.
+
+    Takes the columns as JSON because lists of dicts aren't hashable
+    cache keys; reruns from unrelated widget clicks then reuse the
+    cached frame instead of re-allocating it.
+    """
+    return pd.DataFrame(
+        [
+            {
+                "Column": c["column_name"],
+                "Type": c["pandas_dtype"],
+                "Business Type": c["business_type"],
+                "Nulls %": f"{c['null_percentage']}%",
+                "Unique": c["unique_count"],
+                "Confidence": c["confidence"],
+                "Recommendation": c["recommendation"],
+            }
+            for c in json.loads(columns_data_json)
+        ]
+    )
 
-supervisor = SupervisorAgent()
+
+def _section(title: str, items: dict, expanded: bool = False) -> None:
+    """
+    Render a group of subsections as one markdown payload inside a
+    single expander — one frontend message instead of a widget tree
+    (expander + columns + writes) per subsection
+    """
+    body = "\n\n".join(
+        f"##### {heading}\n\n{text}" for heading, text in items.items()
+    )
+    with st.expander(title, expanded=expanded):
+        st.markdown(body)
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink dtypes after parsing: low-cardinality strings become category
+    codes and small-range numerics are downcast, so every downstream
+    scan moves a fraction of the bytes.
+    """
+    n = len(df)
+    for col in df.select_dtypes(include=["object"]).columns:
+        if df[col].nunique(dropna=False) < max(50, 0.5 * n):
+            df[col] = df[col].astype("category")
+    for col in df.select_dtypes(include=["integer"]).columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include=["float"]).columns:
+        df[col] = pd.to_numeric(df[col], downcast="float")
+    return df
+
+
+@st.cache_data(show_spinner=False, ttl=600)
+def _df_from_parquet(parquet_bytes: bytes) -> pd.DataFrame:
+    """Rebuild the uploaded frame from its Parquet bytes (10 min TTL)"""
+    return pd.read_parquet(io.BytesIO(parquet_bytes))
+
+
+def get_df() -> pd.DataFrame:
+    """
+    The uploaded frame, reconstructed on demand from the session's
+    Parquet copy instead of being pinned in session state
+    """
+    data = st.session_state.parquet_bytes
+    if data is None:
+        return None
+    return _df_from_parquet(data)
+
+
+def read_columns(cols: list = None) -> pd.DataFrame:
+    """
+    Read columns from the session's Parquet copy of the upload.
+
+    Parquet's columnar layout means requesting a subset of columns only
+    decodes those columns' pages; pass cols=None for the full frame.
+    """
+    data = st.session_state.parquet_bytes
+    if data is None:
+        return None
+    return pd.read_parquet(io.BytesIO(data), columns=cols)
 
 
 def main():
     """Main Streamlit application"""
 
-    # Initialize session state
+    supervisor = get_supervisor()
 
     st.title("🤖 Intelligent Agentic ML Product Planner")
     st.markdown("---")
@@ -56,16 +176,34 @@ def main():
     )
 
     if uploaded_file is not None:
-        # Check if this is a new file
-        if st.session_state.last_file != uploaded_file.name:
-            st.session_state.last_file = uploaded_file.name
+        # Check if this is new content — keyed on a hash of the bytes,
+        # so a re-upload with the same name but different data resets
+        # stale results, while a mere rename doesn't
+        file_hash = hashlib.blake2b(
+            uploaded_file.getvalue(), digest_size=16
+        ).hexdigest()
+        if st.session_state.last_file != file_hash:
+            st.session_state.last_file = file_hash
             st.session_state.analysis_results = None
             st.session_state.prd_result = None
+            st.session_state.parquet_bytes = None
 
         try:
-            # Load CSV
-            df = pd.read_csv(uploaded_file, encoding="latin-1")
-            st.session_state.uploaded_df = df
+            # First run for a file parses the CSV and writes a compact
+            # columnar copy; later reruns rebuild the frame from that
+            # copy via get_df() (a zstd Parquet decode, cheaper than
+            # re-parsing the CSV on a cache miss) and read_columns()
+            # serves column-subset reads from it. The frame itself is
+            # deliberately not stored in session_state — Streamlit keeps
+            # session state alive after tab close, so a stored frame
+            # would pin megabytes per session for the process lifetime
+            if st.session_state.parquet_bytes is None:
+                df = _load_csv(uploaded_file.getvalue())
+                buf = io.BytesIO()
+                df.to_parquet(buf, engine="pyarrow", compression="zstd")
+                st.session_state.parquet_bytes = buf.getvalue()
+            else:
+                df = get_df()
 
             # Show preview
             st.success(f"✅ File loaded: {uploaded_file.name}")
@@ -85,14 +223,30 @@ def main():
                     use_container_width=True,
                 )
 
+            # Cap the rows the agents scan; statistics on a 10k sample
+            # are representative and LLM payloads shrink proportionally
+            if len(df) > MAX_ROWS_FOR_ANALYSIS:
+                df_analysis = df.sample(MAX_ROWS_FOR_ANALYSIS, random_state=0)
+                st.caption(
+                    f"⚡ Analysis runs on a random {MAX_ROWS_FOR_ANALYSIS:,}-row "
+                    f"sample of the {len(df):,} uploaded rows"
+                )
+            else:
+                df_analysis = df
+
             if analyze_button:
                 with st.spinner("🤖 Agents are analyzing your data..."):
                     # Initialize supervisor and run analysis
                     # supervisor = SupervisorAgent()
-                    results = supervisor.analyze_dataset(df)
+                    results = supervisor.analyze_dataset(df_analysis)
                     # st.write("DEBUG: Analysis results keys ->", list(results.keys()))
                     st.session_state.analysis_results = results
 
+                # Warm the PRD cache in the background while the user
+                # reads the analysis; the Generate PRD click then
+                # streams from cache instead of decoding live
+                supervisor.prefetch_prd(results)
+
                 st.success("✅ Analysis Complete!")
 
             # STEP 3: Display Results
@@ -115,67 +269,62 @@ def main():
                         "Memory Usage", f"{schema['summary']['memory_usage_mb']:.2f} MB"
                     )
 
-                    st.markdown("### 🔍 Column-by-Column Analysis")
-
-                    # Create detailed table
+                    # Summary table view — one Arrow-serialized widget
+                    # regardless of column count
+                    st.markdown("### 📋 Summary Table View")
                     columns_data = schema["columns"]
+                    summary_df = _summary_df(
+                        json.dumps(columns_data, default=str)
+                    )
+                    st.dataframe(summary_df, use_container_width=True)
 
-                    for col_data in columns_data:
-                        with st.expander(
-                            f"**{col_data['column_name']}** - {col_data['business_type']} ({col_data['confidence']} confidence)"
-                        ):
+                    # Details render only for the selected column; one
+                    # expander per column built a widget tree per column
+                    # and dominated render time on wide CSVs
+                    st.markdown("### 🔍 Column-by-Column Analysis")
+                    selected = st.selectbox(
+                        "Inspect a column", summary_df["Column"]
+                    )
+                    col_data = next(
+                        c for c in columns_data if c["column_name"] == selected
+                    )
 
-                            col_left, col_right = st.columns(2)
+                    col_left, col_right = st.columns(2)
 
-                            with col_left:
-                                st.markdown("**📋 Technical Details**")
-                                st.write(
-                                    f"- **Pandas Type**: `{col_data['pandas_dtype']}`"
-                                )
-                                st.write(
-                                    f"- **Null Count**: {col_data['null_count']} ({col_data['null_percentage']}%)"
-                                )
-                                st.write(
-                                    f"- **Unique Values**: {col_data['unique_count']}"
-                                )
-                                st.write(
-                                    f"- **Sample Values**: {col_data['sample_values']}"
-                                )
+                    with col_left:
+                        st.markdown("**📋 Technical Details**")
+                        st.write(f"- **Pandas Type**: `{col_data['pandas_dtype']}`")
+                        st.write(
+                            f"- **Null Count**: {col_data['null_count']} ({col_data['null_percentage']}%)"
+                        )
+                        st.write(f"- **Unique Values**: {col_data['unique_count']}")
+                        st.write(f"- **Sample Values**: {col_data['sample_values']}")
+
+                        # Decode only the selected column from the
+                        # session's Parquet copy; the columnar layout
+                        # means the other columns' pages are never read
+                        col_df = read_columns([selected])
+                        if col_df is not None:
+                            st.markdown("**📈 Most Frequent Values**")
+                            st.dataframe(
+                                col_df[selected].value_counts().head(5),
+                                use_container_width=True,
+                            )
 
-                            with col_right:
-                                st.markdown("**🤖 AI Interpretation**")
-                                st.write(
-                                    f"- **Business Type**: {col_data['business_type']}"
-                                )
-                                st.write(f"- **Confidence**: {col_data['confidence']}")
-                                st.write(f"- **Reasoning**: {col_data['reasoning']}")
-
-                                # Color-code recommendation
-                                rec = col_data["recommendation"]
-                                if "Keep" in rec:
-                                    st.success(f"✅ {rec}")
-                                elif "Review" in rec:
-                                    st.warning(f"⚠️ {rec}")
-                                else:
-                                    st.info(f"💡 {rec}")
-
-                    # Summary table view
-                    st.markdown("### 📋 Summary Table View")
-                    summary_df = pd.DataFrame(
-                        [
-                            {
-                                "Column": c["column_name"],
-                                "Type": c["pandas_dtype"],
-                                "Business Type": c["business_type"],
-                                "Nulls %": f"{c['null_percentage']}%",
-                                "Unique": c["unique_count"],
-                                "Confidence": c["confidence"],
-                                "Recommendation": c["recommendation"],
-                            }
-                            for c in columns_data
-                        ]
-                    )
-                    st.dataframe(summary_df, use_container_width=True)
+                    with col_right:
+                        st.markdown("**🤖 AI Interpretation**")
+                        st.write(f"- **Business Type**: {col_data['business_type']}")
+                        st.write(f"- **Confidence**: {col_data['confidence']}")
+                        st.write(f"- **Reasoning**: {col_data['reasoning']}")
+
+                        # Color-code recommendation
+                        rec = col_data["recommendation"]
+                        if "Keep" in rec:
+                            st.success(f"✅ {rec}")
+                        elif "Review" in rec:
+                            st.warning(f"⚠️ {rec}")
+                        else:
+                            st.info(f"💡 {rec}")
 
                 # Profile Analysis Section
                 if results.get("profile_analysis"):
@@ -367,77 +516,51 @@ def main():
 
                     deployment = results["deployment_strategy"]
 
-                    # Technical Infrastructure
-                    st.markdown("#### 🏗️ Technical Infrastructure")
-
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        with st.expander("⚙️ Databricks Setup", expanded=False):
-                            st.markdown(deployment.get("databricks_setup", "N/A"))
-
-                        with st.expander("🌐 Serving Strategy", expanded=False):
-                            st.markdown(deployment.get("serving_strategy", "N/A"))
-
-                    with col2:
-                        with st.expander("📊 Monitoring Plan", expanded=False):
-                            st.markdown(deployment.get("monitoring_plan", "N/A"))
-
-                        with st.expander("💾 Data Strategy", expanded=False):
-                            st.markdown(deployment.get("data_strategy", "N/A"))
-
-                    # Team & Timeline
-                    st.markdown("#### 👥 Team & Timeline")
-
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        with st.expander("👨‍💼 Team Requirements", expanded=True):
-                            st.markdown(deployment.get("team_requirements", "N/A"))
-
-                        with st.expander("⚠️ Risk Mitigation", expanded=False):
-                            st.markdown(deployment.get("risk_mitigation", "N/A"))
-
-                    with col2:
-                        with st.expander("📅 Implementation Roadmap", expanded=True):
-                            st.markdown(deployment.get("implementation_roadmap", "N/A"))
-
-                    # Governance & Business
-                    st.markdown("#### 📋 Governance & Business Impact")
-
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        with st.expander("💰 Cost Estimation", expanded=False):
-                            st.markdown(deployment.get("cost_estimation", "N/A"))
-
-                        with st.expander("🎯 Success Metrics", expanded=False):
-                            st.markdown(deployment.get("success_metrics", "N/A"))
+                    _section(
+                        "🏗️ Technical Infrastructure",
+                        {
+                            "⚙️ Databricks Setup": deployment.get("databricks_setup", "N/A"),
+                            "🌐 Serving Strategy": deployment.get("serving_strategy", "N/A"),
+                            "📊 Monitoring Plan": deployment.get("monitoring_plan", "N/A"),
+                            "💾 Data Strategy": deployment.get("data_strategy", "N/A"),
+                        },
+                    )
 
-                    with col2:
-                        with st.expander("🔒 Governance Framework", expanded=False):
-                            st.markdown(deployment.get("governance_framework", "N/A"))
+                    _section(
+                        "👥 Team & Timeline",
+                        {
+                            "👨‍💼 Team Requirements": deployment.get("team_requirements", "N/A"),
+                            "📅 Implementation Roadmap": deployment.get("implementation_roadmap", "N/A"),
+                            "⚠️ Risk Mitigation": deployment.get("risk_mitigation", "N/A"),
+                        },
+                        expanded=True,
+                    )
 
-                        with st.expander("💼 Business Impact", expanded=True):
-                            st.markdown(deployment.get("business_impact", "N/A"))
+                    _section(
+                        "📋 Governance & Business Impact",
+                        {
+                            "💰 Cost Estimation": deployment.get("cost_estimation", "N/A"),
+                            "🎯 Success Metrics": deployment.get("success_metrics", "N/A"),
+                            "🔒 Governance Framework": deployment.get("governance_framework", "N/A"),
+                            "💼 Business Impact": deployment.get("business_impact", "N/A"),
+                        },
+                    )
 
-                    # Operations & Quality
-                    st.markdown("#### 🛠️ Operations & Quality")
+                    _section(
+                        "🛠️ Operations & Quality",
+                        {
+                            "🧪 Testing Framework": deployment.get("testing_framework", "N/A"),
+                            "🚨 Operational Playbook": deployment.get("operational_playbook", "N/A"),
+                            "📚 Enablement Plan": deployment.get("enablement_plan", "N/A"),
+                        },
+                    )
 
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        with st.expander("🧪 Testing Framework", expanded=False):
-                            st.markdown(deployment.get("testing_framework", "N/A"))
-
-                    with col2:
-                        with st.expander("🚨 Operational Playbook", expanded=False):
-                            st.markdown(deployment.get("operational_playbook", "N/A"))
-
-                    with col3:
-                        with st.expander("📚 Enablement Plan", expanded=False):
-                            st.markdown(deployment.get("enablement_plan", "N/A"))
-
-                    # Future Vision
-                    st.markdown("#### 🔮 Future Enhancements")
-                    with st.expander("💡 Roadmap & Innovations", expanded=False):
-                        st.markdown(deployment.get("future_enhancements", "N/A"))
+                    _section(
+                        "🔮 Future Enhancements",
+                        {
+                            "💡 Roadmap & Innovations": deployment.get("future_enhancements", "N/A"),
+                        },
+                    )
                     # Add after Deployment Strategy section
 
                     # Business Communication Section
@@ -448,29 +571,28 @@ def main():
                         biz_comm = results["business_communication"]
 
                         # Executive Summary - Most prominent
-                        st.markdown("#### 📋 Executive Summary")
-                        with st.expander("🎯 One-Page Project Overview", expanded=True):
-                            st.markdown(biz_comm.get("executive_summary", "N/A"))
-
-                        # Risk Matrix & Budget side by side
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            st.markdown("#### ⚠️ Risk Assessment")
-                            with st.expander("📊 Risk Matrix", expanded=False):
-                                st.markdown(biz_comm.get("risk_matrix", "N/A"))
-
-                        with col2:
-                            st.markdown("#### 💰 Investment Case")
-                            with st.expander("💵 Budget & ROI", expanded=False):
-                                st.markdown(biz_comm.get("budget_justification", "N/A"))
-
-                        # Stakeholder Talking Points
-                        st.markdown("#### 💬 Stakeholder Communication")
-                        with st.expander("🗣️ Key Messages by Audience", expanded=False):
-                            st.markdown(
-                                biz_comm.get("stakeholder_talking_points", "N/A")
-                            )
+                        _section(
+                            "📋 Executive Summary",
+                            {
+                                "🎯 One-Page Project Overview": biz_comm.get("executive_summary", "N/A"),
+                            },
+                            expanded=True,
+                        )
+
+                        _section(
+                            "⚠️ Risk Assessment & 💰 Investment Case",
+                            {
+                                "📊 Risk Matrix": biz_comm.get("risk_matrix", "N/A"),
+                                "💵 Budget & ROI": biz_comm.get("budget_justification", "N/A"),
+                            },
+                        )
+
+                        _section(
+                            "💬 Stakeholder Communication",
+                            {
+                                "🗣️ Key Messages by Audience": biz_comm.get("stakeholder_talking_points", "N/A"),
+                            },
+                        )
 
                     # After all existing sections, add PRD generation section at the very end
 
@@ -487,16 +609,24 @@ def main():
                         )
 
                         # Generate PRD Button
-                        if st.button(
+                        generate_clicked = st.button(
                             "🚀 Generate PRD", type="primary", use_container_width=True
-                        ):
-                            # st.write("DEBUG: Before PRD generation - session_state keys:", list(st.session_state.keys()))
-                            # st.write("DEBUG: Analysis Results Available?", 'analysis_results' in st.session_state)
-                            with st.spinner("📝 Generating comprehensive PRD..."):
-                                prd_result = supervisor.generate_prd(
+                        )
+
+                        if generate_clicked:
+                            # Stream the document into the page as it
+                            # generates — first content appears within
+                            # moments instead of after the whole call
+                            st.markdown("#### 📄 Complete PRD Document")
+                            prd_text = st.write_stream(
+                                supervisor.generate_prd_stream(
                                     st.session_state.analysis_results
                                 )
-                                st.session_state.prd_result = prd_result
+                            )
+                            st.session_state.prd_result = {
+                                "prd_document": prd_text,
+                                "status": "success",
+                            }
 
                         # Display PRD if generated
                         if (
@@ -508,10 +638,14 @@ def main():
                             if prd_data["status"] == "success":
                                 st.success("✅ PRD Generated Successfully!")
 
-                                # Display PRD
-                                st.markdown("#### 📄 Complete PRD Document")
-                                with st.expander("📋 View Full PRD", expanded=True):
-                                    st.markdown(prd_data["prd_document"])
+                                # Display PRD (already on screen right
+                                # after streaming)
+                                if not generate_clicked:
+                                    st.markdown("#### 📄 Complete PRD Document")
+                                    with st.expander(
+                                        "📋 View Full PRD", expanded=True
+                                    ):
+                                        st.markdown(prd_data["prd_document"])
 
                                 # Download Button
                                 st.download_button(
@@ -11,7 +11,7 @@ load_dotenv()
 
 # API Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = "gpt-3.5-turbo"  # or "gpt-3.5-turbo" for faster/cheaper
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")  # faster/cheaper default
 
 # Application Settings
 MAX_SAMPLE_VALUES = 5  # Number of sample values to show LLM
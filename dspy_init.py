@@ -1,18 +1,84 @@
+import os
 import threading
 
 import dspy
+import httpx
+import litellm
 
-from config import OPENAI_API_KEY
+from config import OPENAI_API_KEY, OPENAI_MODEL
 
 _lock = threading.Lock()
 _configured = False
 
+# Prompt-hash disk cache for completions; keeping it inside the repo's
+# .cache/ means re-analyzing the same data skips the network even
+# across process restarts
+DSPY_CACHE_DIR = os.getenv("DSPY_CACHE_DIR", os.path.join(".cache", "dspy"))
+
+# Worker pool for dspy.asyncify-wrapped predictors; sized for the per-column
+# fan-outs (ProfileAgent) plus concurrently running agents.
+ASYNC_MAX_WORKERS = 32
+
+# In-flight request cap, sized to the account's rate tier. Every LLM
+# call — sync thread fan-outs and async paths alike — goes through the
+# pooled clients below, so capping their connections bounds concurrency
+# in one place; excess callers queue on the pool instead of tripping
+# rate limits (which llm_retry then backs off on).
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "16"))
+
+# Connection pool shared by every LLM call: one TLS handshake on the first
+# request, keep-alive reuse for the rest of the fan-out.
+POOL_LIMITS = httpx.Limits(
+    max_connections=OPENAI_CONCURRENCY,
+    max_keepalive_connections=OPENAI_CONCURRENCY,
+)
+
+# Per-request ceiling; generous enough for the long PRD completion but
+# bounded so a stuck request frees its pool slot (llm_retry re-issues it)
+REQUEST_TIMEOUT = httpx.Timeout(60.0)
+
+
+def _make_client(cls):
+    """Build a pooled httpx client, with HTTP/2 when h2 is installed"""
+    try:
+        return cls(http2=True, limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+    except ImportError:
+        return cls(limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+
 
 def get_configured_lm():
     global _configured
     if not _configured:
         with _lock:
             if not _configured:
-                dspy.configure(lm=dspy.LM("openai/gpt-4.1", api_key=OPENAI_API_KEY))
+                # Route all LiteLLM traffic through persistent pooled
+                # clients so concurrent agent calls multiplex over warm
+                # connections instead of paying TLS + TCP slow-start each.
+                litellm.client_session = _make_client(httpx.Client)
+                litellm.aclient_session = _make_client(httpx.AsyncClient)
+
+                # Identical prompts resolve from the on-disk completion
+                # cache instead of a fresh API call
+                dspy.configure_cache(
+                    enable_disk_cache=True,
+                    enable_memory_cache=True,
+                    disk_cache_dir=os.path.abspath(DSPY_CACHE_DIR),
+                )
+
+                # cache=True routes repeat prompts through LiteLLM's cache;
+                # provider-side prefix caching then covers the stable
+                # instruction templates the agents send on every call.
+                # Model comes from config (OPENAI_MODEL env to override);
+                # temperature=0 keeps completions deterministic so the
+                # prompt-hash caches actually hit
+                dspy.configure(
+                    lm=dspy.LM(
+                        f"openai/{OPENAI_MODEL}",
+                        api_key=OPENAI_API_KEY,
+                        cache=True,
+                        temperature=0.0,
+                    )
+                )
+                dspy.settings.configure(async_max_workers=ASYNC_MAX_WORKERS)
                 _configured = True
     return dspy.settings.lm
@@ -0,0 +1,123 @@
+"""
+Ahead-of-time compilation of agent predictors
+Bootstraps few-shot demonstrations for each core signature with
+BootstrapFewShot and saves them to artifacts/{Signature}.json; agent
+factories load the artifacts at startup so every run ships optimized
+prompts instead of raw zero-shot predictors.
+
+Run once (or after signature changes):
+
+    python scripts/compile_agents.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dspy
+from dspy.teleprompt import BootstrapFewShot
+
+from dspy_init import get_configured_lm
+from signatures.dspy_signatures import (BusinessCommunicationGenerator,
+                                        DatabricksDeploymentPlanner,
+                                        FeatureEngineeringPlanner,
+                                        MLUseCaseDetector,
+                                        StatisticalInsightGenerator)
+from utils.compiled import ARTIFACTS_DIR, artifact_path
+
+# Minimal representative inputs per signature; BootstrapFewShot runs the
+# teacher over these and keeps the traces whose outputs pass the metric.
+TRAINSETS = {
+    MLUseCaseDetector: [
+        dspy.Example(
+            dataset_overview="Dataset: 10000 rows, 12 columns, 4.2MB",
+            key_columns="customer_id (identifier, 0% nulls, 10000 unique); churned (boolean, 0% nulls, 2 unique); monthly_charges (currency, 0% nulls, 1520 unique); tenure_months (numeric, 0% nulls, 72 unique)",
+            quality_issues="2 issues found: 0 critical, 2 warnings",
+        ),
+        dspy.Example(
+            dataset_overview="Dataset: 5400 rows, 8 columns, 1.1MB",
+            key_columns="listing_id (identifier, 0% nulls, 5400 unique); price (currency, 1% nulls, 830 unique); sqft (numeric, 0% nulls, 612 unique); bedrooms (numeric, 0% nulls, 6 unique)",
+            quality_issues="No quality issues detected",
+        ),
+    ],
+    FeatureEngineeringPlanner: [
+        dspy.Example(
+            column_summary="- churned: boolean, bool, 2 categories\n- monthly_charges: currency, float64\n- tenure_months: numeric, int64\n- contract_type: category, object, 3 categories",
+            target_variable="churned",
+            ml_use_case="Binary Classification",
+            planning_instructions="Generate a concise step-by-step ML plan in markdown covering data preparation, model training, evaluation, tuning, MLflow tracking, and deployment.",
+        ),
+    ],
+    DatabricksDeploymentPlanner: [
+        dspy.Example(
+            ml_use_case="Binary Classification | Target: churned | Score: 85/100",
+            feature_plan="Encode contract_type, scale monthly_charges, derive tenure buckets.",
+            training_plan="Baseline logistic regression, then gradient boosting with stratified 5-fold CV.",
+            data_summary="10000 rows, 12 columns, 4.2MB",
+        ),
+    ],
+    BusinessCommunicationGenerator: [
+        dspy.Example(
+            ml_use_case="Binary Classification targeting churned (Readiness: 85/100)",
+            deployment_summary="Team: 1 ML engineer, 1 data engineer | Timeline: 8 weeks across 3 phases | Costs: ~$3k/month Databricks",
+            technical_risks="Model drift on seasonal behavior; class imbalance in churn labels.",
+            success_metrics="Recall at fixed precision, monthly retention lift.",
+        ),
+    ],
+    StatisticalInsightGenerator: [
+        dspy.Example(
+            column_name="monthly_charges",
+            column_type="numeric",
+            stats_dict='{"max":118.75,"mean":64.76,"median":70.35,"min":18.25,"q25":35.5,"q75":89.85,"skewness":-0.22,"std":30.09}',
+        ),
+    ],
+}
+
+
+# Student module type per signature — must match the module the
+# consuming agent loads the artifact into: a Predict cannot load a
+# ChainOfThought-saved artifact (and vice versa)
+STUDENTS = {
+    MLUseCaseDetector: dspy.ChainOfThought,
+    FeatureEngineeringPlanner: dspy.ChainOfThought,
+    DatabricksDeploymentPlanner: dspy.Predict,
+    BusinessCommunicationGenerator: dspy.Predict,
+    StatisticalInsightGenerator: dspy.Predict,
+}
+
+
+def _outputs_filled(example, prediction, trace=None):
+    """Keep demonstrations whose output fields are all non-empty"""
+    return all(str(getattr(prediction, f, "")).strip() for f in prediction.keys())
+
+
+def compile_signature(signature, trainset):
+    """Bootstrap demonstrations for one signature and save the artifact"""
+    name = signature.__name__
+    print(f"🛠️ Compiling {name} ({len(trainset)} examples)...")
+
+    student = STUDENTS[signature](signature)
+    trainset = [ex.with_inputs(*signature.input_fields) for ex in trainset]
+    teleprompter = BootstrapFewShot(
+        metric=_outputs_filled, max_bootstrapped_demos=2, max_labeled_demos=0
+    )
+    compiled = teleprompter.compile(student, trainset=trainset)
+
+    path = artifact_path(name)
+    compiled.save(path)
+    print(f"✅ Saved {path}")
+
+
+def main():
+    get_configured_lm()
+    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+    for signature, trainset in TRAINSETS.items():
+        try:
+            compile_signature(signature, trainset)
+        except Exception as e:
+            print(f"❌ {signature.__name__} compilation failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
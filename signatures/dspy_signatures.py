@@ -3,8 +3,29 @@ DSPy Signatures - Programmatic Prompt Definitions
 Each signature defines input/output structure for LLM reasoning
 """
 
+import functools
+
 import dspy
 
+__all__ = [
+    "SchemaInterpreter",
+    "SchemaInterpreterBatch",
+    "StatisticalInsightGenerator",
+    "BatchStatisticalInsightGenerator",
+    "QualityRecommender",
+    "MLUseCaseDetector",
+    "FeatureEngineeringPlanner",
+    "DEPLOYMENT_FIELD_GROUPS",
+    "make_deployment_planner",
+    "DatabricksDeploymentPlanner",
+    "BusinessCommunicationGenerator",
+    "UnifiedStrategyGenerator",
+    "PRD_TEMPLATE",
+    "PRD_GUIDANCE",
+    "PRD_SECTION_TEMPLATES",
+    "PRDSectionGenerator",
+]
+
 
 class SchemaInterpreter(dspy.Signature):
     """
@@ -20,16 +41,12 @@ class SchemaInterpreter(dspy.Signature):
     null_count = dspy.InputField(desc="Number of null values")
     unique_count = dspy.InputField(desc="Number of unique values")
     total_count = dspy.InputField(desc="Total number of rows")
-    sample_values = dspy.InputField(desc="List of 2 sample non-null values as string")
+    sample_values = dspy.InputField(desc="JSON list of 2 sample non-null values")
 
-    # Outputs (LLM reasoning)
-    business_type = dspy.OutputField(
-        desc="Business type: 'Identifier', 'Categorical', 'Numeric Metric', 'Date/Time', 'Text', or 'Boolean'"
-    )
-    confidence = dspy.OutputField(desc="Confidence level: 'high', 'medium', or 'low'")
-    reasoning = dspy.OutputField(desc="One sentence explanation for the classification")
-    recommendation = dspy.OutputField(
-        desc="Brief recommendation: 'Keep', 'Review', or 'Consider dropping' with reason"
+    # Output (LLM reasoning) — one JSON field instead of four delimited
+    # sections, so the model decodes values rather than repeated headers
+    result_json = dspy.OutputField(
+        desc="""Compact JSON object: {"type": 'Identifier'|'Categorical'|'Numeric Metric'|'Date/Time'|'Text'|'Boolean', "conf": 'high'|'medium'|'low', "why": one-sentence explanation, "rec": 'Keep'|'Review'|'Consider dropping' with reason}"""
     )
 
 
@@ -43,7 +60,7 @@ class StatisticalInsightGenerator(dspy.Signature):
     column_name = dspy.InputField(desc="Name of the column")
     column_type = dspy.InputField(desc="Type: 'numeric' or 'categorical'")
     stats_dict = dspy.InputField(
-        desc="Dictionary with statistics (mean/median/std for numeric, cardinality/top_values for categorical)"
+        desc="Compact JSON statistics: numeric {m:mean, s:std, p50:median, p25/p75:quartiles, mn:min, mx:max, sk:skewness}; categorical {c:cardinality, n:count, top:top value, tf:top frequency, t5:top 5}"
     )
 
     # Outputs (LLM reasoning)
@@ -58,6 +75,38 @@ class StatisticalInsightGenerator(dspy.Signature):
     )
 
 
+class SchemaInterpreterBatch(dspy.Signature):
+    """
+    Interpret the business meaning of many columns in a single call.
+    Amortizes prompt overhead across all columns instead of one LLM
+    round-trip per column.
+    """
+
+    columns_json = dspy.InputField(
+        desc="JSON list of {column_name, pandas_dtype, null_count, unique_count, total_count, sample_values} objects"
+    )
+
+    interpretations_json = dspy.OutputField(
+        desc="JSON list aligned to input order, each item {business_type, confidence, reasoning, recommendation}"
+    )
+
+
+class BatchStatisticalInsightGenerator(dspy.Signature):
+    """
+    Generate business insights for many columns in a single call.
+    Amortizes prompt overhead across all profiled columns instead of
+    one LLM round-trip per column.
+    """
+
+    columns_json = dspy.InputField(
+        desc="JSON list of {name, type, stats} objects, one per profiled column; stats uses short keys (numeric m/s/p50/p25/p75/mn/mx/sk, categorical c/n/top/tf/t5)"
+    )
+
+    insights_json = dspy.OutputField(
+        desc="JSON list aligned to input order, each item {insight, pattern_detected, actionable_suggestion}"
+    )
+
+
 class QualityRecommender(dspy.Signature):
     """
     Recommend actions to fix data quality issues.
@@ -71,7 +120,7 @@ class QualityRecommender(dspy.Signature):
     issue_description = dspy.InputField(
         desc="Description of the quality issue with counts/percentages"
     )
-    sample_data = dspy.InputField(desc="Sample of affected data")
+    sample_data = dspy.InputField(desc="Sample of affected data as compact JSON")
 
     recommended_action = dspy.OutputField(
         desc="Specific recommendation (e.g., 'Impute with median', 'Drop duplicates', 'Cap outliers')"
@@ -115,14 +164,17 @@ class FeatureEngineeringPlanner(dspy.Signature):
     Provides column-by-column transformation strategy.
     """
 
-    column_summary = dspy.InputField(
-        desc="Key columns with types, cardinality, null%, patterns"
-    )
-    target_variable = dspy.InputField(desc="Selected target variable")
-    ml_use_case = dspy.InputField(desc="Selected ML use case")
+    # Stable-prefix ordering: the per-use-case instructions repeat across
+    # datasets, so putting them first lets provider-side prompt caching
+    # reuse that prefix; the per-dataset column summary goes last
     planning_instructions = dspy.InputField(
         desc="Use case-specific instructions for planning depth and focus areas"
     )
+    ml_use_case = dspy.InputField(desc="Selected ML use case")
+    target_variable = dspy.InputField(desc="Selected target variable")
+    column_summary = dspy.InputField(
+        desc="Key columns with types, cardinality, null%, patterns"
+    )
 
     feature_plan = dspy.OutputField(
         desc="Markdown formatted feature engineering plan with transformations per column"
@@ -135,10 +187,171 @@ class FeatureEngineeringPlanner(dspy.Signature):
     )
 
 
-class DatabricksDeploymentPlanner(dspy.Signature):
+# Output-field groups for the deployment planner. Decoding dominates
+# planner latency, so call sites that consume only a subset of the plan
+# request just those groups and skip decoding the rest
+DEPLOYMENT_FIELD_GROUPS = {
+    "technical": (
+        (
+            "databricks_setup",
+            "Unity Catalog structure, cluster configurations, MLflow experiment setup in markdown with ## headers",
+        ),
+        (
+            "serving_strategy",
+            "Model serving endpoint configuration, API design, versioning strategy, scaling considerations in markdown",
+        ),
+        (
+            "monitoring_plan",
+            "Data drift detection, model performance tracking, alerting setup, dashboard recommendations in markdown",
+        ),
+        (
+            "data_strategy",
+            "Data pipeline architecture, refresh frequency, retention policies, backup strategy in markdown",
+        ),
+    ),
+    "team_timeline": (
+        (
+            "team_requirements",
+            "Required roles (data engineers, data scientists, MLOps, architect), FTE estimates, skill requirements, ramp-up timeline in markdown",
+        ),
+        (
+            "implementation_roadmap",
+            "Phase-wise timeline in weeks (POC: X weeks, Development: Y weeks, UAT: Z weeks, Production: W weeks) with key milestones and deliverables in markdown",
+        ),
+        (
+            "risk_mitigation",
+            "Technical risks, organizational dependencies, data quality risks, mitigation strategies with ownership in markdown",
+        ),
+    ),
+    "governance_business": (
+        (
+            "cost_estimation",
+            "Databricks compute costs, storage costs, serving endpoint costs, monthly estimates, optimization strategies in markdown",
+        ),
+        (
+            "governance_framework",
+            "Unity Catalog permissions, model approval workflow, data access controls, compliance requirements (GDPR/SOC2) in markdown",
+        ),
+        (
+            "success_metrics",
+            "Business KPIs to track, model performance metrics, operational SLAs, reporting cadence in markdown",
+        ),
+        (
+            "business_impact",
+            "ROI estimation, business value drivers, efficiency gains, stakeholder communication plan in markdown",
+        ),
+    ),
+    "operations": (
+        (
+            "testing_framework",
+            "Unit testing strategy, integration tests, model validation tests, data quality tests, CI/CD pipeline in markdown",
+        ),
+        (
+            "operational_playbook",
+            "Incident response procedures, model degradation handling, data pipeline failure recovery, rollback strategy in markdown",
+        ),
+        (
+            "enablement_plan",
+            "Documentation requirements, training sessions for stakeholders, runbooks for operations, knowledge transfer checklist in markdown",
+        ),
+    ),
+    "future": (
+        (
+            "future_enhancements",
+            "Feature store adoption roadmap, A/B testing framework, AutoML integration, model marketplace strategy, advanced monitoring in markdown",
+        ),
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def make_deployment_planner(sections: frozenset = None) -> type:
+    """
+    Build a deployment-planner signature containing only the requested
+    output-field groups (keys of DEPLOYMENT_FIELD_GROUPS; None means
+    all). Specializations are cached, so each call site pays signature
+    construction once.
+    """
+    if sections is None:
+        sections = frozenset(DEPLOYMENT_FIELD_GROUPS)
+    unknown = sections - set(DEPLOYMENT_FIELD_GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown deployment sections: {sorted(unknown)}")
+
+    namespace = {
+        "__doc__": (
+            "Generates comprehensive MLOps deployment strategy covering technical, organizational, and operational aspects.\n"
+            "Provides end-to-end roadmap from development to production."
+        ),
+        "ml_use_case": dspy.InputField(
+            desc="Detected ML use case and target variable"
+        ),
+        "feature_plan": dspy.InputField(desc="Feature engineering strategy"),
+        "training_plan": dspy.InputField(desc="Model training recommendations"),
+        "data_summary": dspy.InputField(desc="Dataset schema and quality summary"),
+    }
+    for group, specs in DEPLOYMENT_FIELD_GROUPS.items():
+        if group in sections:
+            for name, desc in specs:
+                namespace[name] = dspy.OutputField(desc=desc)
+    # The full-field class is the one compiled artifacts are keyed on,
+    # so its __name__ must match the name agents pass to load_compiled
+    name = (
+        "DatabricksDeploymentPlanner"
+        if sections == frozenset(DEPLOYMENT_FIELD_GROUPS)
+        else "DeploymentPlanner"
+    )
+    return type(name, (dspy.Signature,), namespace)
+
+
+# Full planner used by the deployment agent (the app renders every
+# section); specialized call sites use make_deployment_planner directly
+DatabricksDeploymentPlanner = make_deployment_planner()
+
+
+class BusinessCommunicationGenerator(dspy.Signature):
+    """
+    Generates executive-ready business communication materials.
+    Translates technical ML strategy into stakeholder-friendly formats.
+    """
+
+    ml_use_case = dspy.InputField(
+        desc="ML use case, target variable, and readiness score"
+    )
+    deployment_summary = dspy.InputField(
+        desc="Key highlights from deployment strategy: team size, timeline, costs"
+    )
+    technical_risks = dspy.InputField(
+        desc="Summary of technical and organizational risks"
+    )
+    success_metrics = dspy.InputField(
+        desc="Business KPIs and model performance metrics"
+    )
+
+    executive_summary = dspy.OutputField(
+        desc="1-page executive summary in plain English: problem, solution, value, investment, timeline. Use markdown headers and bullet points."
+    )
+    risks_json = dspy.OutputField(
+        desc='Top project risks as a compact JSON list of {"risk","impact","likelihood","owner","mitigation"}; impact and likelihood are High|Medium|Low. Data only — the table is rendered client-side'
+    )
+    timeline_json = dspy.OutputField(
+        desc='Project timeline as a compact JSON list of {"phase","start_week","duration_weeks"} covering POC, Development, UAT, Production. Data only — the Gantt chart is rendered client-side'
+    )
+    budget_justification = dspy.OutputField(
+        desc="Cost breakdown with ROI projection in markdown: investment vs expected returns with payback period"
+    )
+    stakeholder_talking_points = dspy.OutputField(
+        desc="Key messages for different audiences: executives, technical teams, finance, operations in markdown with ## headers"
+    )
+
+
+class UnifiedStrategyGenerator(dspy.Signature):
     """
-    Generates comprehensive MLOps deployment strategy covering technical, organizational, and operational aspects.
-    Provides end-to-end roadmap from development to production.
+    Generates the full deployment strategy and business communication
+    materials in a single call. Fuses DatabricksDeploymentPlanner and
+    BusinessCommunicationGenerator so the shared context (use case,
+    feature plan, data summary) is shipped and decoded once instead of
+    across two back-to-back LLM round-trips.
     """
 
     ml_use_case = dspy.InputField(desc="Detected ML use case and target variable")
@@ -146,7 +359,7 @@ class DatabricksDeploymentPlanner(dspy.Signature):
     training_plan = dspy.InputField(desc="Model training recommendations")
     data_summary = dspy.InputField(desc="Dataset schema and quality summary")
 
-    # Technical Infrastructure
+    # Deployment strategy (mirrors DatabricksDeploymentPlanner outputs)
     databricks_setup = dspy.OutputField(
         desc="Unity Catalog structure, cluster configurations, MLflow experiment setup in markdown with ## headers"
     )
@@ -159,8 +372,6 @@ class DatabricksDeploymentPlanner(dspy.Signature):
     data_strategy = dspy.OutputField(
         desc="Data pipeline architecture, refresh frequency, retention policies, backup strategy in markdown"
     )
-
-    # Team & Timeline
     team_requirements = dspy.OutputField(
         desc="Required roles (data engineers, data scientists, MLOps, architect), FTE estimates, skill requirements, ramp-up timeline in markdown"
     )
@@ -170,8 +381,6 @@ class DatabricksDeploymentPlanner(dspy.Signature):
     risk_mitigation = dspy.OutputField(
         desc="Technical risks, organizational dependencies, data quality risks, mitigation strategies with ownership in markdown"
     )
-
-    # Governance & Business
     cost_estimation = dspy.OutputField(
         desc="Databricks compute costs, storage costs, serving endpoint costs, monthly estimates, optimization strategies in markdown"
     )
@@ -184,8 +393,6 @@ class DatabricksDeploymentPlanner(dspy.Signature):
     business_impact = dspy.OutputField(
         desc="ROI estimation, business value drivers, efficiency gains, stakeholder communication plan in markdown"
     )
-
-    # Operations & Quality
     testing_framework = dspy.OutputField(
         desc="Unit testing strategy, integration tests, model validation tests, data quality tests, CI/CD pipeline in markdown"
     )
@@ -195,40 +402,19 @@ class DatabricksDeploymentPlanner(dspy.Signature):
     enablement_plan = dspy.OutputField(
         desc="Documentation requirements, training sessions for stakeholders, runbooks for operations, knowledge transfer checklist in markdown"
     )
-
-    # Future Vision
     future_enhancements = dspy.OutputField(
         desc="Feature store adoption roadmap, A/B testing framework, AutoML integration, model marketplace strategy, advanced monitoring in markdown"
     )
 
-
-class BusinessCommunicationGenerator(dspy.Signature):
-    """
-    Generates executive-ready business communication materials.
-    Translates technical ML strategy into stakeholder-friendly formats.
-    """
-
-    ml_use_case = dspy.InputField(
-        desc="ML use case, target variable, and readiness score"
-    )
-    deployment_summary = dspy.InputField(
-        desc="Key highlights from deployment strategy: team size, timeline, costs"
-    )
-    technical_risks = dspy.InputField(
-        desc="Summary of technical and organizational risks"
-    )
-    success_metrics = dspy.InputField(
-        desc="Business KPIs and model performance metrics"
-    )
-
+    # Business communication (mirrors BusinessCommunicationGenerator outputs)
     executive_summary = dspy.OutputField(
         desc="1-page executive summary in plain English: problem, solution, value, investment, timeline. Use markdown headers and bullet points."
     )
-    risk_matrix = dspy.OutputField(
-        desc="Risk prioritization matrix in markdown table format with Impact (High/Medium/Low) × Likelihood (High/Medium/Low) grid"
+    risks_json = dspy.OutputField(
+        desc='Top project risks as a compact JSON list of {"risk","impact","likelihood","owner","mitigation"}; impact and likelihood are High|Medium|Low. Data only — the table is rendered client-side'
     )
-    timeline_visual = dspy.OutputField(
-        desc="Mermaid Gantt chart syntax for project timeline with phases: POC, Development, UAT, Production"
+    timeline_json = dspy.OutputField(
+        desc='Project timeline as a compact JSON list of {"phase","start_week","duration_weeks"} covering POC, Development, UAT, Production. Data only — the Gantt chart is rendered client-side'
     )
     budget_justification = dspy.OutputField(
         desc="Cost breakdown with ROI projection in markdown: investment vs expected returns with payback period"
@@ -238,26 +424,11 @@ class BusinessCommunicationGenerator(dspy.Signature):
     )
 
 
-class PRDGenerator(dspy.Signature):
-    """
-    Generates production-grade Product Requirements Document (PRD).
-    Follows industry best practices for ML product specifications.
-    """
-
-    ml_use_case = dspy.InputField(desc="ML use case, target variable, and suitability")
-    feature_engineering = dspy.InputField(
-        desc="Feature engineering plan and training strategy"
-    )
-    deployment_strategy = dspy.InputField(
-        desc="Technical infrastructure, team, timeline, and costs"
-    )
-    business_summary = dspy.InputField(
-        desc="Executive summary, ROI, and stakeholder communication"
-    )
-    quality_issues = dspy.InputField(desc="Data quality summary and risks")
-
-    prd_document = dspy.OutputField(
-        desc="""Generate a comprehensive, production-ready PRD in markdown:
+# Constant PRD scaffold shipped as the first input on every call.
+# Identical bytes each time, so provider-side prefix caching can
+# reuse the multi-KB template instead of billing it as novel input
+# tokens on every generation
+PRD_TEMPLATE = """Generate a comprehensive, production-ready PRD in markdown:
 
 # Product Requirements Document (PRD)
 **Project:** [Auto-generate from ML use case]
@@ -534,4 +705,55 @@ Auto-rollback if:
 8. Keep executive summary under 150 words
 9. Ensure all sections are actionable - no "TBD" without owner and deadline
 10. Format for readability: Headers, bullets, tables, code blocks where appropriate"""
+
+
+def _split_prd_template(template: str) -> tuple:
+    """
+    Carve the monolithic PRD scaffold into per-section templates plus
+    document-wide guidance. The document header rides with the first
+    section; the CRITICAL INSTRUCTIONS block applies to every section.
+    """
+    body, _, instructions = template.partition("**CRITICAL INSTRUCTIONS:**")
+    preamble, _, document = body.partition("\n# ")
+    header, _, rest = ("# " + document).partition("\n## ")
+    sections = ["## " + block.strip() for block in rest.split("\n## ")]
+    sections[0] = header.strip() + "\n\n" + sections[0]
+    guidance = (
+        preamble.strip() + "\n\n**CRITICAL INSTRUCTIONS:**" + instructions.rstrip()
+    )
+    return guidance, tuple(sections)
+
+
+PRD_GUIDANCE, PRD_SECTION_TEMPLATES = _split_prd_template(PRD_TEMPLATE)
+
+
+class PRDSectionGenerator(dspy.Signature):
+    """
+    Generates one section of the PRD from the shared analysis context.
+    Sections are independent, so they decode on parallel requests
+    instead of one long serial generation pass.
+    """
+
+    # Static fields first so the provider prompt cache can reuse them
+    # across datasets (constant guidance, per-section constant template)
+    prd_guidance = dspy.InputField(
+        desc="Document-wide style and content instructions that apply to every section"
+    )
+    section_template = dspy.InputField(
+        desc="Template for the single PRD section to produce"
+    )
+    ml_use_case = dspy.InputField(desc="ML use case, target variable, and suitability")
+    feature_engineering = dspy.InputField(
+        desc="Feature engineering plan and training strategy"
+    )
+    deployment_strategy = dspy.InputField(
+        desc="Technical infrastructure, team, timeline, and costs"
+    )
+    business_summary = dspy.InputField(
+        desc="Executive summary, ROI, and stakeholder communication"
+    )
+    quality_issues = dspy.InputField(desc="Data quality summary and risks")
+
+    section_markdown = dspy.OutputField(
+        desc="The completed section in markdown following section_template; output only this section"
     )
@@ -1,11 +1,26 @@
-def test_app_imports():
+import importlib
+import importlib.util
+
+import pytest
+
+MODULES = ("app", "agents", "signatures")
+
+
+def test_modules_resolvable():
     """
-    Basic smoke test to ensure app and key modules import
+    Fast smoke test: modules resolve on sys.path without executing their
+    bodies (no multi-second dspy/pandas import on every pytest run)
     """
-    import importlib
+    for name in MODULES:
+        assert importlib.util.find_spec(name) is not None, name
 
-    import agents
-    # import app  # ensure top-level app imports successfully
-    import signatures
 
-    # assert app is not None
+@pytest.mark.slow
+def test_app_imports():
+    """
+    Full import of key modules, catching import-time errors in module
+    bodies; marked slow so it runs in CI but not on every iteration
+    (deselect with -m "not slow")
+    """
+    for name in ("agents", "signatures"):
+        assert importlib.import_module(name) is not None
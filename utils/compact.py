@@ -0,0 +1,48 @@
+"""
+Compact serialization of column statistics for LLM prompts
+Same information, far fewer bytes: short stable keys, 4-decimal floats,
+and no whitespace. The deterministic layout also keeps prompt and disk
+caches hitting across runs.
+"""
+
+import json
+
+# Long stat names -> short prompt keys, per column type
+_NUMERIC_KEYS = {
+    "mean": "m",
+    "median": "p50",
+    "std": "s",
+    "min": "mn",
+    "max": "mx",
+    "skewness": "sk",
+    "q25": "p25",
+    "q75": "p75",
+}
+_CATEGORICAL_KEYS = {
+    "cardinality": "c",
+    "total_count": "n",
+    "top_value": "top",
+    "top_frequency": "tf",
+    "top_5_values": "t5",
+}
+
+
+def compact_stats_dict(col_type: str, stats: dict) -> dict:
+    """Map a stats dict onto the short keys for its column type"""
+    keys = _NUMERIC_KEYS if col_type == "numeric" else _CATEGORICAL_KEYS
+    compacted = {}
+    for key, value in stats.items():
+        if isinstance(value, float):
+            value = round(value, 4)
+        compacted[keys.get(key, key)] = value
+    return compacted
+
+
+def compact_stats(col_type: str, stats: dict) -> str:
+    """Deterministic compact JSON of the short-key stats dict"""
+    return json.dumps(
+        compact_stats_dict(col_type, stats),
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
@@ -0,0 +1,26 @@
+"""
+Loading of ahead-of-time compiled DSPy artifacts
+scripts/compile_agents.py bootstraps few-shot demonstrations per
+signature and saves them under artifacts/; predictors pick them up here
+at construction time when present
+"""
+
+import os
+
+ARTIFACTS_DIR = os.getenv("DSPY_ARTIFACTS_DIR", "artifacts")
+
+
+def artifact_path(signature_name: str) -> str:
+    """Path of the compiled artifact for a signature"""
+    return os.path.join(ARTIFACTS_DIR, f"{signature_name}.json")
+
+
+def load_compiled(predictor, signature_name: str):
+    """
+    Load compiled demonstrations into a predictor if an artifact exists;
+    returns the predictor either way so factories can chain it
+    """
+    path = artifact_path(signature_name)
+    if os.path.exists(path):
+        predictor.load(path)
+    return predictor
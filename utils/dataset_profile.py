@@ -0,0 +1,84 @@
+"""
+Lazily computed prompt descriptors over upstream agent results
+The use-case detector and feature planner consume overlapping string
+summaries of the same schema/quality dicts; bundling them on one object
+with cached properties builds each descriptor exactly once per analysis
+and only when first used
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+
+@dataclass
+class DatasetProfile:
+    """One analysis run's descriptor strings, computed on first access"""
+
+    schema_results: dict
+    quality_results: dict = None
+
+    @cached_property
+    def overview_str(self) -> str:
+        """Concise dataset overview for use-case detection"""
+        summary = self.schema_results["summary"]
+        return (
+            f"Dataset: {summary['total_rows']} rows, "
+            f"{summary['total_columns']} columns, "
+            f"{float(summary['memory_usage_mb']):.1f}MB"
+        )
+
+    @cached_property
+    def key_columns_str(self) -> str:
+        """Top-10 column descriptors for use case detection"""
+        return self._column_strings[0]
+
+    @cached_property
+    def column_summary_str(self) -> str:
+        """Top-15 column summary lines for feature planning"""
+        return self._column_strings[1]
+
+    @cached_property
+    def quality_issues_str(self) -> str:
+        """Concise quality summary"""
+        summary = (self.quality_results or {}).get("summary", {})
+        total = summary.get("total_issues", 0)
+        if total == 0:
+            return "No quality issues detected"
+        critical = summary.get("critical", 0)
+        warnings = summary.get("warnings", 0)
+        return f"{total} issues found: {critical} critical, {warnings} warnings"
+
+    @cached_property
+    def _column_strings(self) -> tuple:
+        """
+        Build both column strings in one walk over the schema:
+        - key columns for use case detection (top 10, to save tokens)
+        - column summary for feature planning (top 15, token overflow cap)
+        """
+        top15 = self.schema_results["columns"][:15]
+        key_cols = []
+        summary_lines = []
+
+        for i, col in enumerate(top15):
+            if i < 10:
+                key_cols.append(
+                    f"{col['column_name']} ({col['business_type']}, {col['null_percentage']}% nulls, {col['unique_count']} unique)"
+                )
+
+            line = (
+                f"- {col['column_name']}: {col['business_type']}, {col['pandas_dtype']}"
+            )
+
+            # Add cardinality info
+            if col["unique_count"] < 20:
+                line += f", {col['unique_count']} categories"
+            elif col["unique_count"] == len(top15):
+                line += ", unique identifier"
+
+            # Add null info if significant
+            if col["null_percentage"] > 5:
+                line += f", {col['null_percentage']}% nulls"
+
+            summary_lines.append(line)
+
+        return "; ".join(key_cols), "\n".join(summary_lines)
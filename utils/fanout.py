@@ -0,0 +1,32 @@
+"""
+Bounded async fan-out for per-item LLM calls
+Caps how many calls are in flight at once so a wide per-column gather
+doesn't pin every asyncify worker thread at the same time; callers past
+the cap queue on the semaphore instead
+"""
+
+import asyncio
+
+from dspy_init import OPENAI_CONCURRENCY
+
+
+async def run_many(call, items, *, limit: int = None) -> list:
+    """
+    Run the async callable once per item concurrently, results in input
+    order
+
+    Args:
+        call: async callable invoked as call(item)
+        items: iterable of arguments, one call each
+        limit: max calls in flight (defaults to OPENAI_CONCURRENCY)
+
+    Returns:
+        List of results aligned to items
+    """
+    semaphore = asyncio.Semaphore(limit or OPENAI_CONCURRENCY)
+
+    async def bounded(item):
+        async with semaphore:
+            return await call(item)
+
+    return list(await asyncio.gather(*(bounded(item) for item in items)))
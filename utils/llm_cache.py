@@ -0,0 +1,80 @@
+"""
+Disk-backed output cache for agent LLM calls
+Keyed on a stable hash of the formatted inputs so repeated runs on the
+same (or similar) datasets skip the LLM entirely
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+import diskcache
+
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(".cache", "llm"))
+
+_cache = None
+
+
+def get_cache() -> diskcache.Cache:
+    """Return the shared process-wide cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def cache_key(namespace: str, payload: dict) -> str:
+    """Build a namespaced SHA-256 key from a JSON-serializable payload"""
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def cached_llm(namespace: str, normalize=None):
+    """
+    Decorator caching an LLM-calling method by its keyword arguments.
+
+    The wrapped function must be called with keyword arguments only (self
+    excluded) and return a JSON-serializable value. Exceptions are never
+    cached, so transient failures don't poison warm runs. Works on both
+    sync and async functions.
+
+    normalize, when given, maps the call kwargs to the payload that is
+    actually hashed — callers use it to bucket volatile inputs (exact
+    counts, percentages) so near-identical calls share one cache entry.
+    """
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                key = cache_key(
+                    namespace, normalize(kwargs) if normalize else kwargs
+                )
+                cache = get_cache()
+                hit = cache.get(key)
+                if hit is not None:
+                    return hit
+                result = await fn(*args, **kwargs)
+                cache.set(key, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = cache_key(namespace, normalize(kwargs) if normalize else kwargs)
+            cache = get_cache()
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            result = fn(*args, **kwargs)
+            cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,17 +1,49 @@
+import functools
 import logging
 import os
 
+# The format string never prints thread/process fields, so skip the
+# per-record current_thread()/getpid() lookups that collect them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Built once; every logger shares the same formatter instance
+_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _setup(name: str, level: int) -> logging.Logger:
+    """Configure a named logger once per (name, level) pair"""
+    logger = logging.getLogger(name)
+    if logger.level != level or not logger.handlers:
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(_FORMATTER)
+            logger.addHandler(handler)
+        logger.setLevel(level)
+    return logger
+
 
 def setup_logger(name: str = "agentic", level: str | int = None):
+    """
+    Memoized logger factory: repeat calls with the same name and level
+    return the cached logger without touching env vars, handlers, or
+    setLevel again
+    """
     level = level or os.getenv("LOG_LEVEL", "INFO")
     if isinstance(level, str):
         level = getattr(logging, level.upper(), logging.INFO)
+    return _setup(name, level)
 
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        fmt = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-        handler.setFormatter(logging.Formatter(fmt))
-        logger.addHandler(handler)
-    logger.setLevel(level)
-    return logger
+
+def dbg(logger: logging.Logger, msg: str, *args):
+    """
+    Debug log with %-style deferred formatting: interpolation (and any
+    argument building) is skipped entirely when DEBUG is disabled, so
+    hot loops can log without paying for suppressed records
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
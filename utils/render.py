@@ -0,0 +1,81 @@
+"""
+Client-side rendering of structured LLM output
+The model emits only the data as compact JSON; tables and Mermaid
+boilerplate are rendered deterministically from templates/ here, so no
+decode tokens are spent on presentation markup
+"""
+
+import datetime
+import functools
+import json
+import os
+
+import jinja2
+
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _env() -> jinja2.Environment:
+    """Shared template environment, loaded once per process"""
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+def _parse_list(payload: str):
+    """JSON list of objects from model output, or None when it isn't one"""
+    try:
+        items = json.loads(payload)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(items, list) or not all(
+        isinstance(item, dict) for item in items
+    ):
+        return None
+    return items
+
+
+def render_risk_matrix(risks_json: str) -> str:
+    """
+    Markdown risk table from the model's JSON list; falls back to the
+    raw output when it isn't parseable
+    """
+    risks = _parse_list(risks_json)
+    if not risks:
+        return risks_json
+    return _env().get_template("risk_matrix.md.j2").render(risks=risks)
+
+
+def render_timeline(timeline_json: str) -> str:
+    """
+    Mermaid Gantt chart from the model's phase list; falls back to the
+    raw output when it isn't parseable
+    """
+    phases = _parse_list(timeline_json)
+    if not phases:
+        return timeline_json
+
+    # Week offsets -> concrete dates from the upcoming Monday; the chart
+    # is presentational, so the anchor only needs a plausible start
+    today = datetime.date.today()
+    anchor = today + datetime.timedelta(days=-today.weekday(), weeks=1)
+    rows = []
+    for phase in phases:
+        try:
+            start_week = int(phase.get("start_week", 0))
+            duration = max(int(phase.get("duration_weeks", 1)), 1)
+        except (TypeError, ValueError):
+            start_week, duration = 0, 1
+        rows.append(
+            {
+                "name": str(phase.get("phase", "Phase")),
+                "start": (anchor + datetime.timedelta(weeks=start_week)).isoformat(),
+                "days": duration * 7,
+            }
+        )
+    return _env().get_template("timeline_gantt.md.j2").render(rows=rows)
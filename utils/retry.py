@@ -0,0 +1,29 @@
+"""
+Retry policy for transient LLM provider failures
+Jittered exponential backoff on rate limits and connection errors, so a
+single 429/503 under fan-out load doesn't cascade into a pipeline full
+of "Unable to generate" fallbacks
+"""
+
+import litellm
+from tenacity import (retry, retry_if_exception_type, stop_after_attempt,
+                      wait_random_exponential)
+
+# Provider errors worth retrying; anything else (auth, bad request,
+# context overflow) fails immediately
+RETRYABLE_ERRORS = (
+    litellm.exceptions.RateLimitError,
+    litellm.exceptions.APIConnectionError,
+    litellm.exceptions.InternalServerError,
+    litellm.exceptions.Timeout,
+)
+
+# Shared decorator for every LLM-calling helper; works on sync and async
+# functions alike. reraise=True surfaces the original provider error to
+# the agents' existing except blocks once attempts are exhausted.
+llm_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_random_exponential(min=1, max=20),
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    reraise=True,
+)
@@ -0,0 +1,52 @@
+"""
+Token-accurate text truncation for prompt formatting
+Uses tiktoken so truncation limits map to actual token budget instead of
+character counts; falls back to an ~4-chars-per-token approximation if
+tiktoken is unavailable
+"""
+
+import functools
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with the LLM stack
+    tiktoken = None
+
+# Approximate characters per token for the fallback path
+_CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoder():
+    """
+    Load the cl100k_base encoder once per process; returns None if the
+    encoding files cannot be fetched (e.g. offline environments)
+    """
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens tokens
+
+    Args:
+        text: Input string (non-strings are passed through str())
+        max_tokens: Token budget for the returned string
+
+    Returns:
+        Truncated string, with an ellipsis appended when cut
+    """
+    text = text if isinstance(text, str) else str(text)
+
+    encoder = _get_encoder() if tiktoken is not None else None
+    if encoder is None:
+        limit = max_tokens * _CHARS_PER_TOKEN
+        return text if len(text) <= limit else text[:limit] + "..."
+
+    tokens = encoder.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens]) + "..."